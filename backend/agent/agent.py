@@ -14,29 +14,80 @@ Example:
     Basic agent usage:
         >>> from backend.agent.agent import CommerceAgent
         >>> agent = CommerceAgent()
-        >>> response, products, tool = agent.chat("Show me running shoes")
+        >>> response, products, tool = await agent.chat("Show me running shoes")
         >>> print(f"Found {len(products)} products")
         
     Image-based search:
-        >>> response, products, tool = agent.chat(
+        >>> response, products, tool = await agent.chat(
         ...     "Find similar products",
-        ...     image_base64="base64_encoded_image"
+        ...     image_bytes=open("shoe.jpg", "rb").read()
         ... )
 
 Classes:
     CommerceAgent: Main agent class for handling commerce interactions.
 """
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 from backend.config import get_settings
-from backend.agent.tools import TOOLS, TOOL_MAP
-from backend.agent.prompts import SYSTEM_PROMPT, format_products_for_display 
-from backend.models.schemas import ChatMessage
-from typing import List, Dict, Optional, Tuple, Generator
-import json
+from backend.clients import client as shared_client
+from backend.agent.tools import TEXT_TOOLS, TOOLS, TOOL_MAP, TOOL_IMAGE
+from backend.agent.prompts import SYSTEM_MSG, CANNED_RESPONSES, format_products_for_display
+from backend.models.schemas import ChatMessage, ChatRequest
+from typing import List, Dict, Optional, Tuple, AsyncGenerator
+import asyncio
+import base64
+import orjson
+import re
+import sys
 
 settings = get_settings()
 
+def _sniff_image_mime(image_bytes: bytes) -> str:
+    """Detect the MIME type of an image from its magic bytes.
+    
+    Falls back to image/png, the type previously assumed for all uploads.
+    """
+    if image_bytes.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    if image_bytes.startswith(b"RIFF") and image_bytes[8:12] == b"WEBP":
+        return "image/webp"
+    if image_bytes.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    return "image/png"
+
+def _build_user_message(message: str, image_bytes: Optional[bytes] = None) -> Dict:
+    """Build the user message, inlining an attached image as a data URL.
+    
+    The LLM only accepts images inline, so this is the one place the raw
+    upload is base64-encoded, labelled with its actual format.
+    """
+    if not image_bytes:
+        return {"role": "user", "content": message}
+
+    image_url = "".join((
+        "data:", _sniff_image_mime(image_bytes), ";base64,",
+        base64.b64encode(image_bytes).decode("ascii")
+    ))
+    return {
+        "role": "user",
+        "content": [
+            {"type": "text", "text": message},
+            {"type": "image_url", "image_url": {"url": image_url}}
+        ]
+    }
+
+# Unambiguous small talk that can be answered without an LLM round trip
+_INTENT_PATTERNS = {
+    "greeting": re.compile(
+        r"^\s*(hi|hello|hey|hiya|howdy|good (morning|afternoon|evening))( there)?( shopbot)?\s*[!.]*\s*$",
+        re.IGNORECASE
+    ),
+    "identity": re.compile(
+        r"^\s*(who are you|what are you|what'?s your name|what is your name)( shopbot)?\s*[?!.]*\s*$",
+        re.IGNORECASE
+    )
+}
+
 class CommerceAgent:
     """AI-powered commerce agent for product recommendations and search.
     
@@ -46,20 +97,24 @@ class CommerceAgent:
     
     Attributes:
         settings: Application configuration settings.
-        client: OpenAI client for API communication.
+        client: Async OpenAI client for API communication.
         model: OpenAI model name for chat completions.
     
     Example:
         >>> agent = CommerceAgent()
-        >>> response, products, tool = agent.chat("Show me sports shoes")
+        >>> response, products, tool = await agent.chat("Show me sports shoes")
         >>> print(f"Agent used {tool} and found {len(products)} products")
     """
     
-    def __init__(self):
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
         """Initialize the commerce agent with OpenAI.
         
-        Sets up the OpenAI client using the configured API key and model.
-        This simplified version only supports OpenAI as the LLM provider.
+        Uses the process-wide async OpenAI client unless one is injected,
+        so all agents share a single HTTP connection pool. This simplified
+        version only supports OpenAI as the LLM provider.
+        
+        Args:
+            client: Optional AsyncOpenAI client to use instead of the shared one.
         
         Raises:
             ValueError: If OpenAI API key is not configured.
@@ -68,7 +123,7 @@ class CommerceAgent:
         if not settings.openai_api_key:
             raise ValueError("OpenAI API key is required but not configured")
         
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        self.client = client or shared_client
         self.model = settings.llm_model
     
     def _format_history(self, history: List[ChatMessage]) -> List[Dict]:
@@ -84,24 +139,158 @@ class CommerceAgent:
             List of dictionaries with 'role' and 'content' keys suitable
             for LLM API calls.
         """
-        return [{"role": msg.role, "content": msg.content} for msg in history]
+        return [msg.as_api_dict() for msg in history]
     
-    def chat(
+    def _local_classify(self, message: str, image_bytes: Optional[bytes] = None) -> Optional[str]:
+        """Detect small talk that can be answered without calling the LLM.
+        
+        Only whole-message matches are recognized, so anything that might
+        be a product request still goes to the model. Disabled unless
+        ``local_intent_bypass`` is set.
+        
+        Args:
+            message: User's text message.
+            image_bytes: Attached image; messages with images never match.
+            
+        Returns:
+            Key into CANNED_RESPONSES, or None if the LLM should answer.
+        """
+        if not self.settings.local_intent_bypass or image_bytes:
+            return None
+        for intent, pattern in _INTENT_PATTERNS.items():
+            if pattern.match(message):
+                return intent
+        return None
+
+    def _build_messages(
         self,
         message: str,
         history: List[ChatMessage] = [],
-        image_base64: Optional[str] = None,
+        image_bytes: Optional[bytes] = None
+    ) -> List[Dict]:
+        """Build the message list for a chat completion request.
+        
+        Args:
+            message: User's text message or query.
+            history: Previous conversation history for context.
+            image_bytes: Raw image bytes attached to the message.
+            
+        Returns:
+            System message, formatted history, and the new user message.
+        """
+        return [SYSTEM_MSG, *self._format_history(history), _build_user_message(message, image_bytes)]
+
+    def _start_tool(
+        self,
+        function_name: str,
+        function_args: Dict,
+        image_bytes: Optional[bytes] = None
+    ) -> asyncio.Task:
+        """Schedule a tool call on the event loop and return its task.
+        
+        Args:
+            function_name: Name of a tool registered in TOOL_MAP.
+            function_args: Arguments decoded from the model's tool call.
+            image_bytes: Raw image bytes to pass to image searches.
+            
+        Returns:
+            Task resolving to the tool's product list.
+        """
+        if function_name == TOOL_IMAGE:
+            function_args.pop("image_base64", None)
+            function_args["image_bytes"] = image_bytes
+        return asyncio.ensure_future(TOOL_MAP[function_name](**function_args))
+
+    async def _collect_tool_results(
+        self,
+        calls: List[Tuple[str, str, asyncio.Task]]
+    ) -> Tuple[List[Dict], Optional[List[Dict]], Optional[str]]:
+        """Await running tool calls and build the tool result messages.
+        
+        All tasks are awaited together so total tool latency is that of the
+        slowest call rather than the sum. The first tool error is re-raised
+        once every call has finished.
+        
+        Args:
+            calls: (tool_call_id, function_name, task) tuples in call order.
+            
+        Returns:
+            Tuple containing:
+                - List[Dict]: Tool result messages in the original call order
+                - Optional[List[Dict]]: Products from the last executed tool
+                - Optional[str]: Name of the last executed tool
+        """
+        results = await asyncio.gather(
+            *(task for _, _, task in calls),
+            return_exceptions=True
+        )
+
+        tool_messages = []
+        products = None
+        tool_used = None
+        for (tool_call_id, function_name, _), function_response in zip(calls, results):
+            if isinstance(function_response, Exception):
+                raise function_response
+
+            tool_used = function_name
+            products = function_response
+            tool_messages.append({
+                "role": "tool",
+                "tool_call_id": tool_call_id,
+                "name": function_name,
+                "content": format_products_for_display(function_response)
+            })
+
+        return tool_messages, products, tool_used
+
+    async def _run_tool_calls(
+        self,
+        tool_calls: List,
+        image_bytes: Optional[bytes] = None
+    ) -> Tuple[List[Dict], Optional[List[Dict]], Optional[str]]:
+        """Execute the model's tool calls concurrently.
+        
+        Unknown tool names are skipped, matching the model-facing schema.
+        
+        Args:
+            tool_calls: Tool calls returned by the chat completions API.
+            image_bytes: Raw image bytes to pass to image searches.
+            
+        Returns:
+            Same tuple as _collect_tool_results.
+        """
+        calls = []
+        for tool_call in tool_calls:
+            # Interned so TOOL_MAP lookups hit the identity fast path
+            function_name = sys.intern(tool_call.function.name)
+            if function_name not in TOOL_MAP:
+                continue
+
+            function_args = orjson.loads(tool_call.function.arguments)
+            task = self._start_tool(function_name, function_args, image_bytes)
+            calls.append((tool_call.id, function_name, task))
+
+        return await self._collect_tool_results(calls)
+    
+    async def chat(
+        self,
+        message: str,
+        history: List[ChatMessage] = [],
+        image_bytes: Optional[bytes] = None,
         stream: bool = False
     ) -> Tuple[str, Optional[List[Dict]], Optional[str]]:
         """Main chat interface using OpenAI for all interactions.
         
         This is the primary entry point for all agent interactions using
-        OpenAI's chat completions API with function calling support.
+        OpenAI's chat completions API with function calling support. When a
+        product search tool runs, the formatted results are returned directly
+        unless ``llm_summarize_results`` is enabled, in which case a second
+        completion turns them into a conversational reply.
         
         Args:
             message: User's text message or query.
             history: Previous conversation history for context.
-            image_base64: Base64 encoded image for image-based search.
+            image_bytes: Raw image bytes for image-based search.
             stream: Whether to stream the response or return complete response.
             
         Returns:
@@ -112,35 +301,22 @@ class CommerceAgent:
                 
         Example:
             >>> agent = CommerceAgent()
-            >>> response, products, tool = agent.chat("Show me laptops")
+            >>> response, products, tool = await agent.chat("Show me laptops")
             >>> print(f"Found {len(products or [])} products using {tool}")
         """
         if stream:
-            return self._chat_stream(message, history, image_base64)
-        
-        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-        messages.extend(self._format_history(history))
-
-        if image_base64:
-            user_message = {
-                "role": "user", 
-                "content": [
-                    {"type": "text", "text": message},
-                    {
-                        "type": "image_url",
-                        "image_url": {"url": f"data:image/png;base64,{image_base64}"}
-                    }
-                ]
-            }
-        else:
-            user_message = {"role": "user", "content": message}
+            return self.chat_stream(message, history, image_bytes)
         
-        messages.append(user_message)
+        intent = self._local_classify(message, image_bytes)
+        if intent:
+            return CANNED_RESPONSES[intent], None, None
+
+        messages = self._build_messages(message, history, image_bytes)
 
-        response = self.client.chat.completions.create(
+        response = await self.client.chat.completions.create(
             model=self.model,
             messages=messages,
-            tools=TOOLS,
+            tools=TOOLS if image_bytes else TEXT_TOOLS,
             tool_choice="auto"
         )
 
@@ -152,141 +328,256 @@ class CommerceAgent:
         
         messages.append(response_message)
 
-        products = None
-        tool_used = None
-
-        for tool_call in tool_calls:
-            function_name = tool_call.function.name
-            function_args = json.loads(tool_call.function.arguments)
-
-            if function_name == "search_products_by_image" and image_base64:
-                function_args["image_base64"] = image_base64
-
-            if function_name in TOOL_MAP:
-                tool_used = function_name
-                function_response = TOOL_MAP[function_name](**function_args)
-                products = function_response
+        tool_messages, products, tool_used = await self._run_tool_calls(tool_calls, image_bytes)
+        messages.extend(tool_messages)
 
-                messages.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "name": function_name,
-                    "content": format_products_for_display(function_response)
-                })
+        if tool_used and not self.settings.llm_summarize_results:
+            return format_products_for_display(products), products, tool_used
 
-        final_response = self.client.chat.completions.create(
+        final_response = await self.client.chat.completions.create(
             model=self.model, 
             messages=messages
         )
 
         return final_response.choices[0].message.content, products, tool_used
 
-    def chat_stream(
+    async def chat_stream(
         self,
         message: str,
         history: List[ChatMessage] = [],
-        image_base64: Optional[str] = None
-    ) -> Generator[Dict, None, None]:
-        """Streaming version of chat method."""
-        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-        messages.extend(self._format_history(history))
-
-        if image_base64:
-            user_message = {
-                "role": "user", 
-                "content": [
-                    {"type": "text", "text": message},
-                    {
-                        "type": "image_url",
-                        "image_url": {"url": f"data:image/png;base64,{image_base64}"}
-                    }
-                ]
-            }
-        else:
-            user_message = {"role": "user", "content": message}
+        image_bytes: Optional[bytes] = None
+    ) -> AsyncGenerator[Dict, None]:
+        """Streaming version of chat method.
         
-        messages.append(user_message)
+        The first completion is streamed with tools enabled. Text deltas are
+        forwarded as they arrive, and tool-call deltas are accumulated per
+        index; each tool starts running as soon as its arguments form valid
+        JSON, overlapping the search with the rest of the model's output.
+        """
+        intent = self._local_classify(message, image_bytes)
+        if intent:
+            yield {
+                "type": "content",
+                "content": CANNED_RESPONSES[intent],
+                "products": None,
+                "tool_used": None
+            }
+            yield {
+                "type": "complete",
+                "content": "",
+                "products": None,
+                "tool_used": None
+            }
+            return
+
+        messages = self._build_messages(message, history, image_bytes)
 
-        response = self.client.chat.completions.create(
+        stream_response = await self.client.chat.completions.create(
             model=self.model,
             messages=messages,
-            tools=TOOLS,
+            tools=TOOLS if image_bytes else TEXT_TOOLS,
             tool_choice="auto",
-            stream=False  # First call to check for tool calls
+            stream=True
         )
 
-        response_message = response.choices[0].message
-        tool_calls = response_message.tool_calls
-
-        products = None
-        tool_used = None
-
-        # Handle tool calls first if present
-        if tool_calls:
-            messages.append(response_message)
-
-            for tool_call in tool_calls:
-                function_name = tool_call.function.name
-                function_args = json.loads(tool_call.function.arguments)
-
-                if function_name == "search_products_by_image" and image_base64:
-                    function_args["image_base64"] = image_base64
-
-                if function_name in TOOL_MAP:
-                    tool_used = function_name
-                    function_response = TOOL_MAP[function_name](**function_args)
-                    products = function_response
+        content_parts = []
+        pending_calls: Dict[int, Dict] = {}
 
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "name": function_name,
-                        "content": format_products_for_display(function_response)
-                    })
+        # Tools start while the stream is still being read. If the stream
+        # fails, an argument string is invalid, or the consumer disconnects
+        # and closes this generator, tools still running are cancelled.
+        try:
+            async for chunk in stream_response:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
 
-            # Stream the final response
-            stream_response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                stream=True
-            )
-
-            for chunk in stream_response:
-                if chunk.choices[0].delta.content:
+                if delta.content:
+                    content_parts.append(delta.content)
                     yield {
                         "type": "content",
-                        "content": chunk.choices[0].delta.content,
+                        "content": delta.content,
                         "products": None,
                         "tool_used": None
                     }
 
-            # Send final data with products
+                for tool_delta in delta.tool_calls or []:
+                    call = pending_calls.setdefault(
+                        tool_delta.index,
+                        {"id": None, "name": "", "arguments": "", "task": None}
+                    )
+                    if tool_delta.id:
+                        call["id"] = tool_delta.id
+                    if tool_delta.function:
+                        call["name"] += tool_delta.function.name or ""
+                        call["arguments"] += tool_delta.function.arguments or ""
+
+                    # Start the tool as soon as its arguments are complete
+                    if call["task"] is None and call["name"] in TOOL_MAP:
+                        try:
+                            function_args = orjson.loads(call["arguments"])
+                        except orjson.JSONDecodeError:
+                            continue
+                        call["task"] = self._start_tool(call["name"], function_args, image_bytes)
+
+            # Unknown tool names are skipped, matching the model-facing
+            # schema. They are also left out of the assistant message, since
+            # every tool call it lists needs a tool reply.
+            known_calls = [
+                pending_calls[index] for index in sorted(pending_calls)
+                if pending_calls[index]["name"] in TOOL_MAP
+            ]
+            if not known_calls:
+                yield {
+                    "type": "complete",
+                    "content": "",
+                    "products": None,
+                    "tool_used": None
+                }
+                return
+
+            for call in known_calls:
+                if call["task"] is None:
+                    function_args = orjson.loads(call["arguments"])
+                    call["task"] = self._start_tool(call["name"], function_args, image_bytes)
+
+            messages.append({
+                "role": "assistant",
+                "content": "".join(content_parts) or None,
+                "tool_calls": [
+                    {
+                        "id": call["id"],
+                        "type": "function",
+                        "function": {"name": call["name"], "arguments": call["arguments"]}
+                    }
+                    for call in known_calls
+                ]
+            })
+
+            tool_messages, products, tool_used = await self._collect_tool_results([
+                (call["id"], call["name"], call["task"])
+                for call in known_calls
+            ])
+        finally:
+            for call in pending_calls.values():
+                if call["task"] is not None and not call["task"].done():
+                    call["task"].cancel()
+        messages.extend(tool_messages)
+
+        if tool_used and not self.settings.llm_summarize_results:
+            # Products are already known, reply without a second LLM call
             yield {
-                "type": "complete",
-                "content": "",
-                "products": products,
-                "tool_used": tool_used
+                "type": "content",
+                "content": format_products_for_display(products),
+                "products": None,
+                "tool_used": None
             }
         else:
-            # No tool calls, stream directly
-            stream_response = self.client.chat.completions.create(
+            # Stream the final response
+            stream_response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 stream=True
             )
 
-            for chunk in stream_response:
-                if chunk.choices[0].delta.content:
+            async for chunk in stream_response:
+                if chunk.choices and chunk.choices[0].delta.content:
                     yield {
-                        "type": "content", 
+                        "type": "content",
                         "content": chunk.choices[0].delta.content,
                         "products": None,
                         "tool_used": None
                     }
 
-            yield {
-                "type": "complete",
-                "content": "",
-                "products": None,
-                "tool_used": None
-            }
+        # Send final data with products
+        yield {
+            "type": "complete",
+            "content": "",
+            "products": products,
+            "tool_used": tool_used
+        }
+
+    async def chat_batch(self, requests: List[ChatRequest]) -> str:
+        """Submit chat requests to the OpenAI Batch API.
+        
+        Intended for non-interactive bulk work such as catalog enrichment,
+        where results can arrive within hours in exchange for lower cost and
+        higher rate limits. Batched requests are plain completions without
+        tools, since tool calls cannot be executed between batch turns.
+        
+        Args:
+            requests: Chat requests to submit. Each gets the custom id
+                ``request-<index>`` in the batch.
+            
+        Returns:
+            ID of the created batch, to be passed to await_batch.
+        """
+        lines = []
+        for i, request in enumerate(requests):
+            lines.append(orjson.dumps({
+                "custom_id": f"request-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": self._build_messages(request.message, request.history, request.decode_image())
+                }
+            }))
+
+        batch_file = await self.client.files.create(
+            file=("chat_batch.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+
+    async def await_batch(
+        self,
+        batch_id: str,
+        poll_interval: float = 5.0,
+        max_poll_interval: float = 300.0
+    ) -> Dict[str, Optional[str]]:
+        """Wait for a Batch API job to finish and return its responses.
+        
+        Polls the batch status with exponential backoff, doubling the wait
+        after each check up to ``max_poll_interval`` seconds.
+        
+        Args:
+            batch_id: ID returned by chat_batch.
+            poll_interval: Initial seconds between status checks.
+            max_poll_interval: Upper bound on seconds between checks.
+            
+        Returns:
+            Mapping of custom id to response text, or None for requests
+            whose response was an error. Requests reported only in the
+            batch's error file are omitted.
+            
+        Raises:
+            RuntimeError: If the batch fails, expires, or is cancelled.
+        """
+        while True:
+            batch = await self.client.batches.retrieve(batch_id)
+            if batch.status == "completed":
+                break
+            if batch.status in ("failed", "expired", "cancelled"):
+                raise RuntimeError(f"Batch {batch_id} ended with status {batch.status}")
+            await asyncio.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, max_poll_interval)
+
+        results = {}
+        if batch.output_file_id:
+            output = await self.client.files.content(batch.output_file_id)
+            for line in output.text.splitlines():
+                if not line:
+                    continue
+                result = orjson.loads(line)
+                response = result.get("response") or {}
+                if response.get("status_code") == 200:
+                    results[result["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+                else:
+                    results[result["custom_id"]] = None
+        return results
@@ -0,0 +1,166 @@
+"""Micro-batching of tool-free prompts into shared OpenAI requests.
+
+When many short, independent prompts arrive at high request rates, the
+requests-per-minute limit is reached long before the tokens-per-minute
+limit. This module coalesces prompts arriving within a short window into
+a single chat completion that answers all of them, trading a few
+milliseconds of queueing for several times more prompts per request.
+
+Only tool-free, history-free prompts can be batched. Conversations that
+may need product search tools go through ``BatchedAgent.chat``, which
+forwards them unchanged to the wrapped ``CommerceAgent``.
+
+Warning:
+    Every prompt in a batch is sent to the model in the same JSON user
+    message. A prompt can therefore inject instructions that change the
+    answers to the other prompts in its batch, or get the model to repeat
+    them. Only share a ``BatchedAgent`` between prompts from one trusted
+    caller; never batch prompts from different users together.
+
+Example:
+    >>> batched = BatchedAgent(CommerceAgent(), batch_max=8, batch_window=0.02)
+    >>> reply = await batched.complete("What can you help me with?")
+
+Classes:
+    BatchedAgent: CommerceAgent wrapper that batches tool-free prompts.
+"""
+
+from backend.agent.agent import CommerceAgent
+from backend.agent.prompts import BATCH_PROMPT, SYSTEM_MSG
+from backend.models.schemas import ChatMessage
+from typing import List, Optional, Set, Tuple, Dict
+import asyncio
+import orjson
+
+class BatchedAgent:
+    """CommerceAgent wrapper that batches tool-free prompts per request.
+
+    A background task collects queued prompts until ``batch_max`` are
+    waiting or ``batch_window`` seconds have passed since the first one,
+    then answers them with one JSON-mode chat completion. If the model's
+    reply cannot be matched back to the prompts, each prompt in that batch
+    is retried as its own request.
+
+    All prompts in a batch share one request, so an instance must only be
+    used for a single trusted caller (see the module docstring).
+
+    Attributes:
+        agent: The wrapped CommerceAgent.
+        batch_max: Maximum number of prompts per request.
+        batch_window: Seconds to wait for more prompts after the first.
+    """
+
+    def __init__(self, agent: CommerceAgent, batch_max: int = 8, batch_window: float = 0.02):
+        """Initialize the batching wrapper.
+
+        Args:
+            agent: CommerceAgent whose client and model are used.
+            batch_max: Maximum number of prompts per request.
+            batch_window: Seconds to wait for more prompts after the first.
+        """
+        self.agent = agent
+        self.batch_max = batch_max
+        self.batch_window = batch_window
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Dispatch tasks in flight. The event loop only keeps weak
+        # references to tasks, so they are held here until done.
+        self._dispatches: Set[asyncio.Task] = set()
+
+    async def chat(
+        self,
+        message: str,
+        history: List[ChatMessage] = [],
+        image_bytes: Optional[bytes] = None
+    ) -> Tuple[str, Optional[List[Dict]], Optional[str]]:
+        """Forward a full chat turn to the wrapped agent without batching.
+
+        The tool-calling path depends on each prompt's own tool calls, so it
+        cannot share a request with other prompts.
+        """
+        return await self.agent.chat(message, history, image_bytes)
+
+    async def complete(self, message: str) -> str:
+        """Answer a single tool-free prompt, batched with concurrent ones.
+
+        Args:
+            message: User prompt that needs no history, image, or tools.
+
+        Returns:
+            The agent's response text.
+        """
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((message, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Collect queued prompts into batches and dispatch them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.batch_max:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Answer a batch of prompts and resolve their futures."""
+        try:
+            if len(batch) == 1:
+                responses = [await self._complete_one(batch[0][0])]
+            else:
+                responses = await self._complete_many([message for message, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
+
+    async def _complete_one(self, message: str) -> str:
+        """Answer a single prompt with its own request."""
+        response = await self.agent.client.chat.completions.create(
+            model=self.agent.model,
+            messages=[SYSTEM_MSG, {"role": "user", "content": message}]
+        )
+        return response.choices[0].message.content
+
+    async def _complete_many(self, messages: List[str]) -> List[str]:
+        """Answer several prompts with one JSON-mode request.
+
+        Falls back to one request per prompt if the reply is not valid JSON
+        or does not contain exactly one response per prompt.
+        """
+        response = await self.agent.client.chat.completions.create(
+            model=self.agent.model,
+            messages=[
+                SYSTEM_MSG,
+                {"role": "system", "content": BATCH_PROMPT},
+                {"role": "user", "content": orjson.dumps({"prompts": messages}).decode()}
+            ],
+            response_format={"type": "json_object"}
+        )
+
+        try:
+            responses = orjson.loads(response.choices[0].message.content)["responses"]
+        except (TypeError, KeyError, orjson.JSONDecodeError):
+            responses = None
+
+        if not isinstance(responses, list) or len(responses) != len(messages):
+            return list(await asyncio.gather(*(self._complete_one(m) for m in messages)))
+        return [str(r) for r in responses]
@@ -9,6 +9,12 @@ The system prompt establishes the agent as "ShopBot" with three main capabilitie
     2. Text-based product search and recommendations
     3. Image-based product search and similarity matching
 
+Attributes:
+    SYSTEM_PROMPT: System prompt text defining the agent's behavior.
+    SYSTEM_MSG: Prebuilt system message shared by every chat request.
+    BATCH_PROMPT: Instructions for answering several prompts in one request.
+    CANNED_RESPONSES: Replies for small talk answered without calling the LLM.
+
 Functions:
     format_products_for_display: Formats product lists for user presentation.
 """
@@ -40,6 +46,20 @@ For general questions about yourself or casual conversation:
 
 Always be friendly, helpful, and concise. Keep responses focused on the user's immediate request."""
 
+# Built once and shared by every request; callers must not mutate it.
+SYSTEM_MSG: Dict = {"role": "system", "content": SYSTEM_PROMPT}
+
+BATCH_PROMPT = """You will receive a JSON object with a "prompts" list. Each prompt comes from a different user and is independent of the others.
+
+Answer every prompt separately, as ShopBot, without referring to the other prompts.
+
+Return a JSON object of the form {"responses": ["...", "..."]} containing exactly one response string per prompt, in the same order as the prompts."""
+
+CANNED_RESPONSES: Dict[str, str] = {
+    "greeting": "Hi there! I'm ShopBot. Tell me what you're looking for, or upload a photo and I'll find similar products.",
+    "identity": "I'm ShopBot, your AI shopping assistant. I can chat, find products from a description, and find items similar to an image you upload."
+}
+
 def format_products_for_display(products: List[Dict]) -> str:
     """Format product list for LLM presentation to users.
     
@@ -72,9 +92,13 @@ def format_products_for_display(products: List[Dict]) -> str:
     if not products:
         return "No matching products found."
     
-    formatted = "Here are the products I found:\n\n"
+    parts = ["Here are the products I found:\n\n"]
     for i, product in enumerate(products, 1):
-        formatted += f"{i}. **{product['name']}** - ${product['price']}\n"
-        formatted += f"   {product['description'][:100]}...\n"
-        formatted += f"   Category: {product['category']}\n\n"
-    return formatted
\ No newline at end of file
+        name, price = product['name'], product['price']
+        description, category = product['description'], product['category']
+        parts.append(
+            f"{i}. **{name}** - ${price}\n"
+            f"   {description[:100]}...\n"
+            f"   Category: {category}\n\n"
+        )
+    return "".join(parts)
\ No newline at end of file
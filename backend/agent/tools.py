@@ -5,6 +5,7 @@ perform product searches and recommendations. It includes both text-based
 and image-based search capabilities using embedding and vector similarity.
 
 The module defines:
+    - Lazily created, process-wide service instances
     - Tool functions for product search
     - OpenAI function calling schemas
     - Tool mapping for function dispatch
@@ -15,25 +16,155 @@ Tools:
 
 Example:
     >>> from backend.agent.tools import search_products_by_text
-    >>> products = search_products_by_text("running shoes", n_results=3)
+    >>> products = await search_products_by_text("running shoes", n_results=3)
     >>> print(f"Found {len(products)} products")
 """
 
-from typing import List, Dict
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Dict, Optional
+import asyncio
+import hashlib
+import threading
 from backend.services.embedding_service import EmbeddingService
-from backend.services.image_service import ImageService
-from backend.services.vector_store import VectorStore
+from backend.services.memory_store import InMemoryVectorStore
+from backend.services.vector_store import VectorStore, create_vector_store
+from backend.config import get_settings
 
-embedding_service = EmbeddingService()
-image_service = ImageService()
-vector_store = VectorStore()  
+if TYPE_CHECKING:
+    from backend.services.image_service import ImageService
 
-def search_products_by_text(query: str, n_results: int = 5) -> List[Dict]:
+settings = get_settings()
+
+# Dedicated pool for blocking image decoding, CLIP forward passes and
+# vector-store calls, so tool work never competes with other users of the
+# default executor. Text embeddings are native async and do not use it.
+_tool_executor = ThreadPoolExecutor(
+    max_workers=settings.tool_executor_workers,
+    thread_name_prefix="tool"
+)
+
+# One lock per singleton, so loading CLIP does not hold up the first
+# text search or the vector store.
+_embedding_service = None
+_embedding_service_lock = threading.Lock()
+_image_service = None
+_image_service_lock = threading.Lock()
+_vector_store = None
+_vector_store_lock = threading.Lock()
+
+# In-memory copy of a small catalog, searched instead of the persistent
+# vector store once load_memory_store has run.
+_memory_store: Optional[InMemoryVectorStore] = None
+
+_IMAGE_CACHE_SIZE = 256
+_image_embedding_cache: "OrderedDict[bytes, object]" = OrderedDict()
+_image_cache_lock = threading.Lock()
+
+def get_embedding_service() -> EmbeddingService:
+    """Get the shared EmbeddingService, creating it on first use."""
+    global _embedding_service
+    if _embedding_service is None:
+        with _embedding_service_lock:
+            if _embedding_service is None:
+                _embedding_service = EmbeddingService()
+    return _embedding_service
+
+def get_image_service() -> "ImageService":
+    """Get the shared ImageService, loading the CLIP model on first use.
+
+    The image service module is imported here so text-only code paths
+    never load torch.
+    """
+    global _image_service
+    if _image_service is None:
+        with _image_service_lock:
+            if _image_service is None:
+                from backend.services.image_service import ImageService
+                _image_service = ImageService(executor=_tool_executor)
+    return _image_service
+
+def get_vector_store() -> VectorStore:
+    """Get the shared vector store, opening the configured backend on first use."""
+    global _vector_store
+    if _vector_store is None:
+        with _vector_store_lock:
+            if _vector_store is None:
+                _vector_store = create_vector_store()
+    return _vector_store
+
+def load_memory_store() -> Optional[InMemoryVectorStore]:
+    """Load the catalog into memory for exact brute-force search.
+
+    Copies every product and its text and image embeddings out of the
+    persistent vector store. Once loaded, searches scan the in-memory
+    matrices with SIMD cosine kernels instead of querying the database.
+    Catalogs larger than ``memory_store_max_products`` stay in the
+    persistent store, where the HNSW index scales better. The flat
+    backend is already searched this way, so it is used as is.
+
+    Returns:
+        The store searched in memory, or None if the catalog is empty or
+        too large.
+    """
+    global _memory_store
+    vector_store = get_vector_store()
+    if isinstance(vector_store, InMemoryVectorStore):
+        return vector_store
+    # Counted first so a catalog too large for memory is never copied.
+    size = vector_store.count_products()
+    if 0 < size <= settings.memory_store_max_products:
+        _memory_store = InMemoryVectorStore.from_vector_store(vector_store)
+    return _memory_store
+
+def _search_store():
+    """Return the store searches should use: in-memory when loaded."""
+    return _memory_store or get_vector_store()
+
+async def _cached_image_embedding(image_bytes: bytes):
+    """Get the CLIP embedding for an image, memoized by content hash.
+
+    The cache key is a BLAKE2b digest of the image bytes, so the same
+    upload sent again skips the CLIP forward pass. Least recently used
+    entries are evicted once the cache holds more than
+    ``_IMAGE_CACHE_SIZE`` images. Cache misses are decoded on the tool
+    executor and encoded through the image service's batching queue, so
+    concurrent image searches share forward passes.
+    """
+    key = hashlib.blake2b(image_bytes, digest_size=16).digest()
+
+    with _image_cache_lock:
+        if key in _image_embedding_cache:
+            _image_embedding_cache.move_to_end(key)
+            return _image_embedding_cache[key]
+
+    image_service = get_image_service()
+    image = await _run_blocking(image_service.decode_image, image_bytes)
+    embedding = await image_service.encode_image_async(image)
+
+    with _image_cache_lock:
+        _image_embedding_cache[key] = embedding
+        _image_embedding_cache.move_to_end(key)
+        if len(_image_embedding_cache) > _IMAGE_CACHE_SIZE:
+            _image_embedding_cache.popitem(last=False)
+    return embedding
+
+async def _run_blocking(func, *args):
+    """Run a blocking call on the tool executor without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_tool_executor, func, *args)
+
+async def search_products_by_text(query: str, n_results: int = 5) -> List[Dict]:
     """Search for products based on text description using semantic similarity.
     
     Uses text embeddings to find products that semantically match the
     provided query. This enables natural language product search that
     understands intent and context beyond simple keyword matching.
+    The embedding request is awaited on the async OpenAI client and the
+    vector search runs on the tool executor, so the event loop stays free
+    while the tool executes. When the catalog has been loaded with
+    ``load_memory_store``, it is searched in memory instead of querying
+    the vector store.
     
     Args:
         query: The text query describing desired products (e.g., 
@@ -45,45 +176,56 @@ def search_products_by_text(query: str, n_results: int = 5) -> List[Dict]:
         relevance score from the vector similarity search.
         
     Example:
-        >>> products = search_products_by_text("wireless headphones")
+        >>> products = await search_products_by_text("wireless headphones")
         >>> for product in products:
         ...     print(f"{product['name']} - ${product['price']}")
     """
-    query_embedding = embedding_service.get_text_embedding(query)
-    products = vector_store.search_text(query_embedding, n_results)
-    return products
+    query_embedding = await get_embedding_service().get_text_embedding(query)
+    return await _run_blocking(_search_store().search_text, query_embedding, n_results)
 
-def search_products_by_image(image_base64: str, n_results: int = 5) -> List[Dict]:
+async def search_products_by_image(image_bytes: Optional[bytes] = None, n_results: int = 5) -> List[Dict]:
     """Search for products similar to an uploaded image using computer vision.
     
     Uses image embeddings to find products visually similar to the
     uploaded image. This enables "search by image" functionality where
-    users can upload photos to find similar products.
+    users can upload photos to find similar products. Encoding is batched
+    with concurrent image searches and, like the vector search, runs off
+    the event loop.
+    
+    The image is not part of the model-facing schema; the agent passes
+    the raw bytes of the user's upload directly. Turns without an upload
+    are offered ``TEXT_TOOLS``, which leaves this tool out; if it is
+    called anyway, it finds nothing instead of failing the turn.
     
     Args:
-        image_base64: Base64 encoded image data (JPEG, PNG supported).
+        image_bytes: Raw image file bytes (JPEG, PNG supported).
         n_results: Maximum number of similar products to return.
         
     Returns:
         List of product dictionaries visually similar to the input image,
-        ordered by visual similarity score.
+        ordered by visual similarity score, or an empty list if no image
+        was uploaded with the message.
         
     Example:
         >>> with open("shoe_image.jpg", "rb") as f:
-        ...     img_base64 = base64.b64encode(f.read()).decode()
-        >>> products = search_products_by_image(img_base64, n_results=3)
+        ...     products = await search_products_by_image(f.read(), n_results=3)
         >>> for product in products:
         ...     print(f"Similar: {product['name']}")
     """
-    query_embedding = image_service.encode_image_from_base64(image_base64)
-    products = vector_store.search_image(query_embedding, n_results)
-    return products
+    if not image_bytes:
+        return []
+
+    query_embedding = await _cached_image_embedding(image_bytes)
+    return await _run_blocking(_search_store().search_image, query_embedding, n_results)
+
+TOOL_TEXT = "search_products_by_text"
+TOOL_IMAGE = "search_products_by_image"
 
 TOOLS = [
     {
         "type": "function",
         "function": {
-            "name": "search_products_by_text",
+            "name": TOOL_TEXT,
             "description": "Search for products in the catalog based on a text description. Use this when the user asks for product recommendations or wants to find specific items.",
             "parameters": {
                 "type": "object",
@@ -105,28 +247,26 @@ TOOLS = [
     {
         "type": "function",
         "function": {
-            "name": "search_products_by_image",
-            "description": "Search for products similar to an uploaded image. Use this when the user uploads an image and wants to find similar products.",
+            "name": TOOL_IMAGE,
+            "description": "Search for products similar to the image the user uploaded with their message. Use this when the user uploads an image and wants to find similar products.",
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "image_base64": {
-                        "type": "string",
-                        "description": "Base64 encoded image data"
-                    },
                     "n_results": {
                         "type": "integer",
                         "description": "Number of products to return (default 5)",
                         "default": 5
                     }
-                },
-                "required": ["image_base64"]
+                }
             }
         }
     }
 ]
 
+# Offered on turns without an uploaded image, where image search cannot run.
+TEXT_TOOLS = [tool for tool in TOOLS if tool["function"]["name"] != TOOL_IMAGE]
+
 TOOL_MAP = {
-    "search_products_by_text": search_products_by_text,
-    "search_products_by_image": search_products_by_image
+    TOOL_TEXT: search_products_by_text,
+    TOOL_IMAGE: search_products_by_image
 }
\ No newline at end of file
@@ -1,14 +1,15 @@
 """Chat endpoints for AI agent interactions."""
 
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 import logging
-import json
+import orjson
 
-from backend.models.schemas import ChatRequest, ChatResponse
+from backend.models.schemas import ChatRequest, ChatResponse, chat_response_adapter
 from backend.agent.agent import CommerceAgent
+from backend.api.routing import ORJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ORJSONRoute)
 agent = CommerceAgent()
 logger = logging.getLogger(__name__)
 
@@ -31,17 +32,21 @@ async def chat(request: ChatRequest):
         HTTPException: 500 error if agent processing fails.
     """
     try:
-        response_text, products, tool_used = agent.chat(
+        response_text, products, tool_used = await agent.chat(
             message=request.message,
             history=request.history,
-            image_base64=request.image
+            image_bytes=request.decode_image()
         )
         
-        return ChatResponse(
-            message=response_text,
-            products=products,
-            tool_used=tool_used
-        )
+        # Validated once and encoded to JSON bytes by pydantic-core, with no
+        # intermediate dict tree; returning a response directly skips
+        # FastAPI's second response_model pass.
+        response = chat_response_adapter.validate_python({
+            "message": response_text,
+            "products": products,
+            "tool_used": tool_used
+        })
+        return Response(chat_response_adapter.dump_json(response), media_type="application/json")
     
     except Exception as e:
         logger.error(f"Error in chat endpoint: {str(e)}")
@@ -68,15 +73,15 @@ async def chat_stream(request: ChatRequest):
         HTTPException: 500 error if agent processing fails.
     """
     try:
-        def generate():
+        async def generate():
             try:
-                for chunk in agent.chat_stream(
+                async for chunk in agent.chat_stream(
                     message=request.message,
                     history=request.history,
-                    image_base64=request.image
+                    image_bytes=request.decode_image()
                 ):
-                    yield f"data: {json.dumps(chunk)}\n\n"
-                yield "data: [DONE]\n\n"
+                    yield b"data: " + orjson.dumps(chunk) + b"\n\n"
+                yield b"data: [DONE]\n\n"
             except Exception as e:
                 logger.error(f"Error in streaming: {str(e)}")
                 error_chunk = {
@@ -85,16 +90,15 @@ async def chat_stream(request: ChatRequest):
                     "products": None,
                     "tool_used": None
                 }
-                yield f"data: {json.dumps(error_chunk)}\n\n"
-                yield "data: [DONE]\n\n"
+                yield b"data: " + orjson.dumps(error_chunk) + b"\n\n"
+                yield b"data: [DONE]\n\n"
 
         return StreamingResponse(
             generate(),
-            media_type="text/plain",
+            media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "Content-Type": "text/event-stream"
+                "Connection": "keep-alive"
             }
         )
     
@@ -5,6 +5,18 @@ from backend.config import get_settings
 import time
 
 router = APIRouter()
+settings = get_settings()
+
+# Settings are immutable for the process lifetime, so validate them once
+_CONFIG_OK = bool(settings.openai_api_key and settings.llm_model)
+
+# Critical services only need to import successfully once per process
+try:
+    from backend.agent.agent import CommerceAgent
+    from backend.services.vector_store import VectorStore
+    _SERVICES_OK = True
+except ImportError:
+    _SERVICES_OK = False
 
 @router.get("/health")
 async def health_check():
@@ -23,17 +35,11 @@ async def health_check():
     start_time = time.time()
     
     try:
-        # Check 1: Configuration is loaded
-        settings = get_settings()
-        config_ok = bool(settings.openai_api_key and settings.llm_model)
+        # Check 1: Configuration is loaded (validated at import)
+        config_ok = _CONFIG_OK
         
-        # Check 2: Can import critical services (basic validation)
-        try:
-            from backend.agent.agent import CommerceAgent
-            from backend.services.vector_store import VectorStore
-            services_ok = True
-        except ImportError:
-            services_ok = False
+        # Check 2: Critical services imported (verified at import)
+        services_ok = _SERVICES_OK
         
         response_time = int((time.time() - start_time) * 1000)
         
@@ -0,0 +1,43 @@
+"""Custom FastAPI routing that parses JSON request bodies with orjson.
+
+FastAPI reads request bodies through ``Request.json()``, which uses the
+stdlib ``json`` module. Chat requests can carry large base64 images, so
+routes built with ``ORJSONRoute`` decode the body with orjson instead and
+hand the resulting dict to Pydantic for validation as usual.
+
+Example:
+    >>> router = APIRouter(route_class=ORJSONRoute)
+
+Classes:
+    ORJSONRequest: Request whose ``json()`` is decoded with orjson.
+    ORJSONRoute: APIRoute that serves handlers an ORJSONRequest.
+"""
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+from starlette.responses import Response
+from typing import Any, Callable, Coroutine
+import orjson
+
+class ORJSONRequest(Request):
+    """Request whose JSON body is decoded with orjson and cached.
+
+    ``orjson.JSONDecodeError`` subclasses ``json.JSONDecodeError``, so
+    malformed bodies still produce FastAPI's usual 422 response.
+    """
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+class ORJSONRoute(APIRoute):
+    """APIRoute that parses JSON request bodies with orjson."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def orjson_route_handler(request: Request) -> Response:
+            return await handler(ORJSONRequest(request.scope, request.receive))
+
+        return orjson_route_handler
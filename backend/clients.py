@@ -0,0 +1,39 @@
+"""Shared API clients for the AI Commerce Agent.
+
+Holds the process-wide async OpenAI client used by every CommerceAgent
+and the EmbeddingService. It lives outside both the agent and services
+packages so either can import it without importing the other.
+
+The client is backed by a single httpx connection pool sized from
+settings. HTTP/2 is negotiated with the OpenAI API over TLS (ALPN), so
+concurrent chat and embedding requests are multiplexed over a few
+connections instead of each holding its own. Its chat completion and
+embedding calls are throttled to the configured concurrency, request and
+token budgets.
+
+Attributes:
+    client (RateLimitedClient): Shared, rate-limited async OpenAI client.
+"""
+
+import httpx
+from openai import AsyncOpenAI
+from backend.config import get_settings
+from backend.rate_limit import RateLimitedClient
+
+settings = get_settings()
+
+client = RateLimitedClient(
+    AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        http_client=httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=settings.openai_max_connections,
+                max_keepalive_connections=settings.openai_max_keepalive_connections
+            )
+        )
+    ),
+    max_concurrent=settings.openai_max_concurrent,
+    requests_per_minute=settings.openai_requests_per_minute,
+    tokens_per_minute=settings.openai_tokens_per_minute
+)
@@ -24,7 +24,8 @@ Note:
 """
 
 from pydantic_settings import BaseSettings
-from functools import lru_cache
+from typing import Optional
+import os
 
 class Settings(BaseSettings):
     """Application settings and configuration.
@@ -37,11 +38,42 @@ class Settings(BaseSettings):
         openai_api_key (str): OpenAI API key for LLM and embedding services.
         llm_model (str): Specific OpenAI model name to use for chat completions.
         embedding_model (str): OpenAI model name for text embeddings.
+        openai_max_connections (int): Connection pool size of the shared
+            OpenAI HTTP client.
+        openai_max_keepalive_connections (int): Idle connections kept open
+            by the shared OpenAI HTTP client.
+        openai_max_concurrent (int): Maximum chat completion and embedding
+            requests in flight.
+        openai_requests_per_minute (int): Client-side chat completion and
+            embedding request budget per minute.
+        openai_tokens_per_minute (int): Client-side estimated prompt and
+            embedding input token budget per minute.
+        llm_summarize_results (bool): Make a second LLM call to summarize
+            product search results instead of returning them formatted.
+        local_intent_bypass (bool): Answer simple greetings and identity
+            questions with canned replies instead of calling the LLM.
+        tool_executor_workers (int): Threads available for blocking tool work:
+            image decoding, CLIP encoding and vector search.
         app_name (str): Application name for API documentation.
         debug (bool): Enable debug mode with verbose logging.
         products_path (str): Relative path to products JSON file.
         images_path (str): Relative path to product images directory.
         vector_db_path (str): Relative path to vector database storage.
+        vector_store_backend (str): Vector store implementation, "usearch",
+            "chroma", or "flat" for memory-mapped float16 brute force.
+        usearch_dtype (str): Scalar type USearch quantizes vectors to, such
+            as "f16" or "i8".
+        usearch_connectivity (int): HNSW graph degree of USearch indexes.
+        usearch_expansion_add (int): USearch candidate list size on insert.
+        usearch_expansion_search (int): USearch candidate list size on search.
+        chroma_hnsw_m (int): HNSW graph degree of new Chroma collections.
+        chroma_hnsw_construction_ef (int): Chroma candidate list size on insert.
+        chroma_hnsw_search_ef (int): Chroma candidate list size on search.
+        memory_store_max_products (int): Largest catalog that is loaded into
+            memory at startup and searched by exact brute force instead of
+            the persistent vector store; 0 disables the in-memory store.
+        warm_up_image_service (bool): Load the CLIP model at startup instead
+            of on the first image search.
     
     Example:
         >>> settings = Settings()
@@ -51,6 +83,14 @@ class Settings(BaseSettings):
     openai_api_key: str = ""
     llm_model: str = "gpt-4o-mini"
     embedding_model: str = "text-embedding-3-small"
+    openai_max_connections: int = 256
+    openai_max_keepalive_connections: int = 128
+    openai_max_concurrent: int = 64
+    openai_requests_per_minute: int = 500
+    openai_tokens_per_minute: int = 200000
+    llm_summarize_results: bool = False
+    local_intent_bypass: bool = False
+    tool_executor_workers: int = min(32, (os.cpu_count() or 1) * 5)
 
     app_name: str = "AI Commerce Agent"
     debug: bool = True
@@ -58,12 +98,31 @@ class Settings(BaseSettings):
     products_path: str = "data/products.json"
     images_path: str = "data/product_images"
     vector_db_path: str = "data/vector_db"
+    vector_store_backend: str = "usearch"
+    usearch_dtype: str = "f16"
+    usearch_connectivity: int = 16
+    usearch_expansion_add: int = 64
+    usearch_expansion_search: int = 100
+    chroma_hnsw_m: int = 32
+    chroma_hnsw_construction_ef: int = 128
+    chroma_hnsw_search_ef: int = 64
+    memory_store_max_products: int = 50000
+    warm_up_image_service: bool = True
 
     class Config:
         env_file = ".env"
         extra = "allow"
 
-@lru_cache()
-def get_settings():
-    """Get cached application settings instance."""
-    return Settings()
\ No newline at end of file
+_settings: Optional[Settings] = None
+
+def get_settings() -> Settings:
+    """Get the process-wide application settings instance.
+
+    Settings are parsed from the environment on the first call and the
+    same instance is returned afterwards, without a cache wrapper on the
+    call path.
+    """
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
\ No newline at end of file
@@ -19,48 +19,132 @@ Attributes:
     settings (Settings): Application configuration settings.
 """
 
-import subprocess
-import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Optional
+import fcntl
+import hashlib
+import os
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from backend.config import get_settings
 from backend.api.routes import chat, health
+from backend.agent.tools import (
+    get_embedding_service, get_image_service, get_vector_store, load_memory_store
+)
 import uvicorn
 
 settings = get_settings()
 
+# Bump when the vector store layout changes so existing installs re-run setup.
+SETUP_SCHEMA_VERSION = "1"
+SETUP_SENTINEL = Path("data/.setup_ok")
+SETUP_LOCK = Path("data/.setup.lock")
+
+def _index_fingerprint() -> str:
+    """Fingerprint the settings the stored embeddings and indexes were built with.
+    
+    Covers the schema version, backend, embedding model and the index
+    settings that are fixed once an index is created. The USearch search
+    expansion is left out because it is applied every time an index is
+    opened.
+    """
+    key = ":".join(str(value) for value in (
+        SETUP_SCHEMA_VERSION,
+        settings.vector_store_backend,
+        settings.embedding_model,
+        settings.chroma_hnsw_m,
+        settings.chroma_hnsw_construction_ef,
+        settings.chroma_hnsw_search_ef,
+        settings.usearch_dtype,
+        settings.usearch_connectivity,
+        settings.usearch_expansion_add
+    ))
+    return hashlib.sha256(key.encode()).hexdigest()
+
+def _setup_fingerprint() -> str:
+    """Fingerprint the catalog and index settings a setup was built from."""
+    try:
+        mtime = Path(settings.products_path).stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime = 0
+    return f"{mtime}:{_index_fingerprint()}"
+
+def _read_sentinel() -> Optional[str]:
+    """Return the fingerprint of the last completed setup, if any."""
+    try:
+        return SETUP_SENTINEL.read_text()
+    except FileNotFoundError:
+        return None
+
+def _setup_is_current() -> bool:
+    """Check whether the sentinel matches the current catalog and settings."""
+    return _read_sentinel() == _setup_fingerprint()
+
+def _index_changed() -> bool:
+    """Check whether the last completed setup used other index settings.
+    
+    Stored vectors are only reused when the embedding model and index
+    settings are unchanged; otherwise setup rebuilds the store.
+    """
+    sentinel = _read_sentinel()
+    return sentinel is not None and sentinel.rpartition(":")[2] != _index_fingerprint()
+
 def setup_data():
-    """Initialize data by running setup scripts if needed."""
+    """Initialize data by running the setup scripts in-process if needed.
+
+    A completed setup writes ``data/.setup_ok`` holding the catalog's
+    mtime and a hash of ``SETUP_SCHEMA_VERSION``, the vector store
+    backend, the embedding model and the index settings; setup is skipped
+    while it matches. If the catalog alone changed, setup updates the
+    store in place; if the model or index settings changed, the store is
+    emptied and rebuilt. The sentinel is written
+    atomically only after every step succeeds, so an interrupted run is
+    retried on the next boot. Setup runs under an exclusive file lock so
+    concurrently starting workers do not build the vector store twice.
+    """
     try:
         print("Starting Data Setup...")
         print("==================================================")  
 
-        products_file = Path("data/products.json")
-        vector_db_path = Path("data/vector_store")
-        
-        if products_file.exists() and vector_db_path.exists():
+        if _setup_is_current():
             print("Data already initialized, skipping setup...")
             return
 
-        print("Setting up AI Commerce Agent Data")
-        print("==================================================")  
-        result = subprocess.run([
-            sys.executable, "scripts/seed_products.py"
-        ], capture_output=True, text=True, cwd=Path.cwd())
-        
-        if result.returncode != 0:
-            print(f"Error seeding products: {result.stderr}")
-            return
-        print("Creating vector store with product embeddings...")
-        print("==================================================")
-        result = subprocess.run([
-            sys.executable, "scripts/setup_data.py"
-        ], capture_output=True, text=True, cwd=Path.cwd())
-        
-        if result.returncode != 0:
-            print(f"Error setting up data: {result.stderr}")
-            return
+        SETUP_LOCK.parent.mkdir(parents=True, exist_ok=True)
+        with open(SETUP_LOCK, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            # Another worker may have finished setup while we waited.
+            if _setup_is_current():
+                print("Data already initialized, skipping setup...")
+                return
+
+            # Imported here so boots with data already in place never load the
+            # setup scripts; both run in this interpreter, reusing its imports.
+            from scripts.seed_products import main as seed_main
+            from scripts.setup_data import main as setup_main
+
+            print("Setting up AI Commerce Agent Data")
+            print("==================================================")  
+            if not Path(settings.products_path).exists():
+                try:
+                    seed_main()
+                except Exception as e:
+                    print(f"Error seeding products: {e}")
+                    return
+            print("Creating vector store with product embeddings...")
+            print("==================================================")
+            try:
+                setup_main(get_vector_store(), rebuild=_index_changed())
+            except Exception as e:
+                print(f"Error setting up data: {e}")
+                return
+
+            tmp_sentinel = SETUP_SENTINEL.with_suffix(".tmp")
+            tmp_sentinel.write_text(_setup_fingerprint())
+            os.replace(tmp_sentinel, SETUP_SENTINEL)
             
         print("Data setup completed successfully!")
         print("")
@@ -68,6 +152,27 @@ def setup_data():
     except Exception as e:
         print(f"Error during data setup: {e}")
 
+def warm_up():
+    """Create the shared services before the first request needs them.
+
+    Creates the embedding service and vector store, and the CLIP image
+    service when ``warm_up_image_service`` is set, once so the first user
+    request does not pay their initialization cost, then loads small
+    catalogs into the in-memory vector store for exact brute-force search.
+    Without the image warm-up, CLIP is loaded by the first image search.
+    """
+    get_embedding_service()
+    if settings.warm_up_image_service:
+        get_image_service()
+    get_vector_store()
+    load_memory_store()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up shared services before the server accepts requests."""
+    warm_up()
+    yield
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application.
     
@@ -80,13 +185,17 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.app_name,
         description="AI-powered commerce agent for product recommendations",
-        version="1.0.0"
+        version="1.0.0",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan
     )
 
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=["*"], 
-        allow_credentials=True,
+        # No endpoint uses cookies or auth headers, so credentials stay off
+        # and Starlette can answer with a static wildcard origin.
+        allow_origins=["*"],
+        allow_credentials=False,
         allow_methods=["*"],
         allow_headers=["*"],
     )
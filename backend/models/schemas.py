@@ -10,6 +10,9 @@ Models:
     ChatRequest: Request model for chat API endpoint.
     ChatResponse: Response model for chat API endpoint.
 
+Attributes:
+    chat_response_adapter: Prebuilt TypeAdapter for ChatResponse.
+
 Example:
     >>> from backend.models.schemas import Product, ChatRequest
     >>> product = Product(
@@ -20,8 +23,9 @@ Example:
     >>> request = ChatRequest(message="Show me running shoes")
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import Optional, List, Dict
+import base64
 
 class Product(BaseModel):
     """Represents a product in the commerce catalog.
@@ -75,6 +79,10 @@ class ChatMessage(BaseModel):
     role: str = Field(..., description="Message role: 'user' or 'assistant'")
     content: str = Field(..., description="Message text content")
 
+    def as_api_dict(self) -> Dict[str, str]:
+        """Return the message in chat completions API format."""
+        return {"role": self.role, "content": self.content}
+
 class ChatRequest(BaseModel):
     """Request model for the chat API endpoint.
     
@@ -100,6 +108,21 @@ class ChatRequest(BaseModel):
     image: Optional[str] = Field(None, description="Base64 encoded image")
     history: List[ChatMessage] = Field(default_factory=list, description="Conversation history")
 
+    def decode_image(self) -> Optional[bytes]:
+        """Decode the attached image once into raw bytes.
+        
+        Accepts raw base64 or a data URL (data:image/jpeg;base64,...).
+        
+        Returns:
+            The image file bytes, or None if no image was attached.
+        """
+        if not self.image:
+            return None
+        # A data URL header is short, so only its first bytes are scanned.
+        idx = self.image.find(",", 0, 64)
+        payload = self.image[idx + 1:] if idx != -1 else self.image
+        return base64.b64decode(payload)
+
 class ChatResponse(BaseModel):
     """Response model for the chat API endpoint.
     
@@ -123,4 +146,9 @@ class ChatResponse(BaseModel):
     tool_used: Optional[str] = Field(None, description="Tool used for response")
 
 
-  
\ No newline at end of file
+  
+
+# Build the core schemas once at import time; route handlers validate and
+# dump through this adapter instead of re-resolving the model per call.
+ChatResponse.model_rebuild()
+chat_response_adapter = TypeAdapter(ChatResponse)
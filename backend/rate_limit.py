@@ -0,0 +1,159 @@
+"""Client-side rate limiting for OpenAI chat completion and embedding requests.
+
+This module throttles outgoing chat completion and embedding calls
+before they reach OpenAI, so bursts of traffic queue locally instead of tripping the
+provider's requests-per-minute and tokens-per-minute limits and falling
+into 429 retry storms.
+
+The limiter combines three controls:
+    - A semaphore capping in-flight requests
+    - A token bucket for requests per minute
+    - A token bucket for estimated prompt tokens per minute
+
+Chat completions and embeddings share all three, so embedding traffic
+counts against the same budgets as the agent's chat requests.
+
+Example:
+    >>> limited = RateLimitedClient(
+    ...     AsyncOpenAI(), max_concurrent=64,
+    ...     requests_per_minute=500, tokens_per_minute=200_000
+    ... )
+    >>> response = await limited.chat.completions.create(model=..., messages=...)
+
+Classes:
+    TokenBucket: Async token bucket refilled continuously over a period.
+    RateLimitedClient: AsyncOpenAI wrapper that throttles chat completions
+        and embeddings.
+"""
+
+from types import SimpleNamespace
+from typing import Any, Dict, List, Union
+import asyncio
+import time
+
+# Rough tokens-per-character ratio for English text, used instead of a
+# tokenizer so the estimate stays cheap on the request path.
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(messages: List[Any]) -> int:
+    """Estimate the prompt token count of a chat completion request.
+
+    Args:
+        messages: Chat messages as dicts or SDK message objects. Multimodal
+            content lists are counted by their text parts only.
+
+    Returns:
+        Approximate number of prompt tokens, at least 1.
+    """
+    chars = 0
+    for message in messages:
+        content = message.get("content") if isinstance(message, dict) else getattr(message, "content", None)
+        if isinstance(content, str):
+            chars += len(content)
+        elif isinstance(content, list):
+            chars += sum(len(part.get("text", "")) for part in content if isinstance(part, dict))
+    return max(1, chars // CHARS_PER_TOKEN)
+
+def estimate_input_tokens(input: Union[str, List[str]]) -> int:
+    """Estimate the token count of an embedding request.
+
+    Args:
+        input: Text or list of texts to embed. Pre-tokenized inputs are
+            counted as one token per item.
+
+    Returns:
+        Approximate number of input tokens, at least 1.
+    """
+    texts = [input] if isinstance(input, str) else input
+    chars = sum(len(text) if isinstance(text, str) else len(text) * CHARS_PER_TOKEN for text in texts)
+    return max(1, chars // CHARS_PER_TOKEN)
+
+class TokenBucket:
+    """Async token bucket that refills continuously over a fixed period.
+
+    Waiters are served in arrival order. Requests larger than the bucket
+    capacity are clamped to the capacity so they can eventually proceed.
+
+    Attributes:
+        capacity: Maximum number of tokens the bucket holds.
+        rate: Tokens added per second.
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        """Initialize a full bucket.
+
+        Args:
+            capacity: Tokens available per period.
+            period: Refill period in seconds.
+        """
+        self.capacity = capacity
+        self.rate = capacity / period
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1) -> None:
+        """Wait until ``amount`` tokens are available and consume them."""
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+class RateLimitedClient:
+    """AsyncOpenAI wrapper that throttles chat completion and embedding requests.
+
+    Exposes ``chat.completions.create`` and ``embeddings.create`` with the
+    same signatures as the wrapped client; every other attribute is
+    delegated unchanged.
+
+    Attributes:
+        chat: Namespace exposing the rate-limited ``completions.create``.
+        embeddings: Namespace exposing the rate-limited ``create``.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        max_concurrent: int,
+        requests_per_minute: int,
+        tokens_per_minute: int
+    ):
+        """Wrap an AsyncOpenAI client with request and token limits.
+
+        Args:
+            client: AsyncOpenAI client to forward requests to.
+            max_concurrent: Maximum requests in flight.
+            requests_per_minute: Request budget per minute.
+            tokens_per_minute: Estimated prompt and input token budget per minute.
+        """
+        self._client = client
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._request_bucket = TokenBucket(requests_per_minute)
+        self._token_bucket = TokenBucket(tokens_per_minute)
+        self.chat = SimpleNamespace(
+            completions=SimpleNamespace(create=self._create_chat_completion)
+        )
+        self.embeddings = SimpleNamespace(create=self._create_embedding)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    async def _create_chat_completion(self, **kwargs: Dict) -> Any:
+        """Create a chat completion once the rate limits allow it."""
+        async with self._semaphore:
+            await self._request_bucket.acquire()
+            await self._token_bucket.acquire(estimate_tokens(kwargs.get("messages", [])))
+            return await self._client.chat.completions.create(**kwargs)
+
+    async def _create_embedding(self, **kwargs: Dict) -> Any:
+        """Create embeddings once the rate limits allow it."""
+        async with self._semaphore:
+            await self._request_bucket.acquire()
+            await self._token_bucket.acquire(estimate_input_tokens(kwargs.get("input", [])))
+            return await self._client.embeddings.create(**kwargs)
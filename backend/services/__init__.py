@@ -1,12 +1,41 @@
 """
 Service layer for AI/ML operations.
+
+Services are imported on first attribute access (PEP 562), so importing
+this package does not pull in torch or transformers until ImageService
+is actually used.
 """
-from backend.services.embedding_service import EmbeddingService
-from backend.services.image_service import ImageService
-from backend.services.vector_store import VectorStore
+from typing import TYPE_CHECKING
+import importlib
+
+# SimSIMD must be loaded before USearch, which bundles the same kernels:
+# if USearch loads first, simsimd.cdist rejects every input with
+# "Input tensors must have matching datatypes". Every backend module is
+# imported through this package, so importing SimSIMD here first keeps
+# the in-memory store's SIMD path working whichever store loads first.
+try:
+    import simsimd  # noqa: F401
+except ImportError:
+    pass
+
+if TYPE_CHECKING:
+    from backend.services.embedding_service import EmbeddingService
+    from backend.services.image_service import ImageService
+    from backend.services.vector_store import VectorStore
+
+_LAZY = {
+    "EmbeddingService": "backend.services.embedding_service",
+    "ImageService": "backend.services.image_service",
+    "VectorStore": "backend.services.vector_store"
+}
 
 __all__ = [
     "EmbeddingService",
     "ImageService",
     "VectorStore"
-]
\ No newline at end of file
+]
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_LAZY[name]), name)
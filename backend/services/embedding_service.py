@@ -10,20 +10,54 @@ The service is used for:
     - Creating query embeddings for semantic search
     - Computing similarity scores between texts
 
+Embeddings are memoized in a process-wide LRU cache keyed by model and
+text as read-only float32 arrays, and concurrent requests for the same uncached text share a single
+API call. Requests go through the agent's shared, rate-limited
+AsyncOpenAI client, so embedding calls never block the event loop and
+share its connection pool and request budgets.
+
 Example:
     >>> from backend.services.embedding_service import EmbeddingService
     >>> service = EmbeddingService()
-    >>> embedding = service.get_text_embedding("running shoes")
+    >>> embedding = await service.get_text_embedding("running shoes")
     >>> print(f"Embedding dimension: {len(embedding)}")
 """
 
-from openai import OpenAI
+from openai import AsyncOpenAI
+from backend.clients import client as shared_client
 from backend.config import get_settings
-from typing import List
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
+import asyncio
 import numpy as np
+import threading
 
 settings = get_settings()
-client = OpenAI(api_key=settings.openai_api_key)
+
+_CACHE_SIZE = 4096
+_cache: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+_in_flight: Dict[Tuple[str, str], "asyncio.Task"] = {}
+_cache_lock = threading.Lock()
+
+def _frozen(embedding: List[float]) -> np.ndarray:
+    """Convert an API embedding to a read-only float32 array.
+    
+    Cached arrays are handed to every caller without copying, so they are
+    made immutable instead.
+    """
+    array = np.asarray(embedding, dtype=np.float32)
+    array.flags.writeable = False
+    return array
+
+def _cache_put(key: Tuple[str, str], embedding: np.ndarray) -> None:
+    """Store an embedding, evicting the least recently used entry if full.
+    
+    Must be called with ``_cache_lock`` held.
+    """
+    _cache[key] = embedding
+    _cache.move_to_end(key)
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
 
 class EmbeddingService:
     """Service for generating and managing text embeddings using OpenAI.
@@ -34,70 +68,122 @@ class EmbeddingService:
     
     Attributes:
         model: The embedding model name configured in settings.
+        client: AsyncOpenAI client used for embedding requests.
         
     Example:
         >>> service = EmbeddingService()
-        >>> embedding = service.get_text_embedding("comfortable running shoes")
+        >>> embedding = await service.get_text_embedding("comfortable running shoes")
         >>> similarity = service.cosine_similarity(embedding1, embedding2)
     """
     
-    def __init__(self):
-        """Initialize the embedding service with configured model."""
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
+        """Initialize the embedding service with configured model.
+        
+        Args:
+            client: AsyncOpenAI client to use. Defaults to the shared
+                rate-limited client from ``backend.clients``.
+        """
         self.model = settings.embedding_model
+        self.client = client or shared_client
 
-    def get_text_embedding(self, text: str) -> List[float]:
+    async def get_text_embedding(self, text: str) -> np.ndarray:
         """Generate embedding vector for a single text input.
         
         Converts the input text into a high-dimensional vector representation
         that captures semantic meaning using OpenAI's embedding models.
+        Repeated texts are served from the cache, and concurrent callers
+        asking for the same uncached text wait on one shared API call.
         
         Args:
             text: Input text to convert to embedding.
             
         Returns:
-            List of floats representing the text embedding vector.
+            Read-only float32 array holding the text embedding vector.
             
         Example:
             >>> service = EmbeddingService()
-            >>> embedding = service.get_text_embedding("laptop computer")
+            >>> embedding = await service.get_text_embedding("laptop computer")
             >>> print(f"Vector dimension: {len(embedding)}")
         """
-        response = client.embeddings.create(
-            model=self.model,
-            input=text
-        )
-        return response.data[0].embedding
+        key = (self.model, text)
+        with _cache_lock:
+            if key in _cache:
+                _cache.move_to_end(key)
+                return _cache[key]
+            task = _in_flight.get(key)
+            if task is None:
+                task = _in_flight[key] = asyncio.ensure_future(self._embed(key))
+
+        # Shielded so a cancelled caller does not cancel the shared request.
+        return await asyncio.shield(task)
+
+    async def _embed(self, key: Tuple[str, str]) -> np.ndarray:
+        """Fetch one embedding from the API and cache it."""
+        try:
+            response = await self.client.embeddings.create(
+                model=self.model,
+                input=key[1]
+            )
+            embedding = _frozen(response.data[0].embedding)
+            with _cache_lock:
+                _cache_put(key, embedding)
+            return embedding
+        finally:
+            with _cache_lock:
+                _in_flight.pop(key, None)
     
-    def get_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
+    async def get_batch_embeddings(self, texts: List[str]) -> List[np.ndarray]:
         """Generate embeddings for multiple texts in a single API call.
         
         More efficient than calling get_text_embedding multiple times
-        when processing large batches of text.
+        when processing large batches of text. Cached texts are served from
+        memory and only the remaining unique texts are sent to the API.
         
         Args:
             texts: List of text strings to convert to embeddings.
             
         Returns:
-            List of embedding vectors, one for each input text.
+            List of read-only float32 embedding arrays, one for each
+            input text.
             
         Example:
             >>> service = EmbeddingService()
             >>> texts = ["laptop", "smartphone", "tablet"]
-            >>> embeddings = service.get_batch_embeddings(texts)
+            >>> embeddings = await service.get_batch_embeddings(texts)
             >>> print(f"Generated {len(embeddings)} embeddings")
         """
-        response = client.embeddings.create(
-            model=self.model,
-            input=texts
-        )
-        return [item.embedding for item in response.data]
+        results: List[np.ndarray] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+        with _cache_lock:
+            for i, text in enumerate(texts):
+                key = (self.model, text)
+                if key in _cache:
+                    _cache.move_to_end(key)
+                    results[i] = _cache[key]
+                else:
+                    missing.setdefault(text, []).append(i)
+
+        if missing:
+            uncached = list(missing)
+            response = await self.client.embeddings.create(
+                model=self.model,
+                input=uncached
+            )
+            with _cache_lock:
+                for text, item in zip(uncached, response.data):
+                    embedding = _frozen(item.embedding)
+                    _cache_put((self.model, text), embedding)
+                    for i in missing[text]:
+                        results[i] = embedding
+        return results
     
     def cosine_similarity(self, a: List[float], b: List[float]) -> float:
         """Calculate cosine similarity between two embedding vectors.
         
         Computes the cosine of the angle between two vectors, providing
         a similarity score between -1 and 1, where 1 indicates identical
-        semantic meaning and 0 indicates no similarity.
+        semantic meaning and 0 indicates no similarity. OpenAI embeddings
+        are returned unit-normalized, so this reduces to a dot product.
         
         Args:
             a: First embedding vector.
@@ -108,11 +194,9 @@ class EmbeddingService:
             
         Example:
             >>> service = EmbeddingService()
-            >>> emb1 = service.get_text_embedding("running shoes")
-            >>> emb2 = service.get_text_embedding("athletic footwear")
+            >>> emb1 = await service.get_text_embedding("running shoes")
+            >>> emb2 = await service.get_text_embedding("athletic footwear")
             >>> similarity = service.cosine_similarity(emb1, emb2)
             >>> print(f"Similarity: {similarity:.3f}")
         """
-        a = np.array(a)
-        b = np.array(b)
-        return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
\ No newline at end of file
+        return float(np.dot(np.asarray(a, dtype=np.float32), np.asarray(b, dtype=np.float32)))
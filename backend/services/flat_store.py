@@ -0,0 +1,149 @@
+"""Flat half-precision vector store memory-mapped from disk.
+
+This module provides ``FlatVectorStore``, a persistent variant of the
+in-memory brute-force store. Each collection is written as a raw
+``(N, D)`` float16 matrix of unit-length rows plus a JSON sidecar holding
+the product records, and is opened with ``np.memmap``. Startup maps the
+file instead of reading vectors out of a database, the matrix is shared
+through the page cache, and every scan moves half the bytes of float32.
+
+There is no graph index: searches are exact scans, so this backend is
+meant for catalogs small enough for brute force. Select it with
+``VECTOR_STORE_BACKEND=flat``; the agent tools then search it directly
+instead of copying the catalog into an ``InMemoryVectorStore``.
+
+Example:
+    >>> store = FlatVectorStore()
+    >>> store.add_products_text(products, text_embeddings)
+    >>> results = store.search_text(query_embedding, n_results=5)
+
+Dependencies:
+    - numpy: Memory-mapped embedding matrices
+    - orjson: For reading and writing the product sidecar files
+
+Classes:
+    FlatCollection: One memory-mapped matrix plus its product records.
+    FlatVectorStore: Text and image collections behind the VectorStore API.
+"""
+
+from backend.config import get_settings
+from backend.services.memory_store import InMemoryCollection, InMemoryVectorStore
+from backend.services.vector_store import _product_metadata
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import numpy as np
+import orjson
+import os
+
+settings = get_settings()
+
+class FlatCollection(InMemoryCollection):
+    """An in-memory collection persisted as a float16 matrix file.
+
+    The matrix lives at ``<path>.f16`` and the product records, in row
+    order, at ``<path>.f16.json``. Between writes ``embeddings`` is a
+    read-only memory map of the matrix file.
+
+    Attributes:
+        path: Path prefix of the matrix and sidecar files.
+    """
+
+    def __init__(self, path: Path):
+        """Open a collection, mapping the matrix if it has been written.
+
+        Args:
+            path: Path prefix of the matrix and sidecar files.
+        """
+        super().__init__()
+        self.path = path
+        records_file = path.with_suffix(".f16.json")
+        if records_file.exists():
+            records = orjson.loads(records_file.read_bytes())
+            self.products = records["products"]
+            self.documents = records["documents"]
+            self._metadatas = [_product_metadata(p) for p in self.products]
+            self._positions = {p["id"]: row for row, p in enumerate(self.products)}
+            self._map(records["dim"])
+
+    def _map(self, dim: int) -> None:
+        """Map the matrix file read-only as ``embeddings``."""
+        if self.products:
+            self.embeddings = np.memmap(
+                self.path.with_suffix(".f16"),
+                dtype=np.float16,
+                mode="r",
+                shape=(len(self.products), dim)
+            )
+
+    def upsert(self, products: List[Dict], embeddings: Any, documents: Optional[List[str]] = None) -> None:
+        """Insert or replace products, then rewrite and remap the files."""
+        if not len(products):
+            return
+        if self.embeddings is not None:
+            # The memory map is read-only; edit a float32 copy.
+            self.embeddings = np.array(self.embeddings, dtype=np.float32)
+        super().upsert(products, embeddings, documents)
+        self.save()
+
+    def clear(self) -> None:
+        """Drop every product and delete the matrix and sidecar files."""
+        super().clear()
+        self.path.with_suffix(".f16").unlink(missing_ok=True)
+        self.path.with_suffix(".f16.json").unlink(missing_ok=True)
+
+    def delete(self, ids: List[str]) -> bool:
+        """Remove products, then rewrite and remap the files."""
+        deleted = super().delete(ids)
+        if deleted:
+            self.save()
+        return deleted
+
+    def update_records(self, products: List[Dict]) -> None:
+        """Replace the records of stored products and rewrite the sidecar."""
+        super().update_records(products)
+        if self.embeddings is not None:
+            self.save()
+
+    def save(self) -> None:
+        """Write the matrix and product records atomically and remap them."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        matrix_file = self.path.with_suffix(".f16")
+        records_file = self.path.with_suffix(".f16.json")
+        tmp_matrix = matrix_file.with_suffix(".f16.tmp")
+        tmp_records = self.path.with_suffix(".f16.json.tmp")
+        if self.embeddings is None:
+            # Every product was deleted; keep an empty matrix file.
+            dim = 0
+            tmp_matrix.write_bytes(b"")
+        else:
+            dim = self.embeddings.shape[1]
+            self.embeddings.astype(np.float16).tofile(tmp_matrix)
+        tmp_records.write_bytes(orjson.dumps({
+            "dim": dim,
+            "products": self.products,
+            "documents": self.documents
+        }))
+        os.replace(tmp_matrix, matrix_file)
+        os.replace(tmp_records, records_file)
+        self._map(dim)
+
+class FlatVectorStore(InMemoryVectorStore):
+    """Exact vector store over memory-mapped float16 matrices.
+
+    Exposes the same methods as the ChromaDB ``VectorStore``. Filtered
+    searches select the matching rows before computing any distances.
+
+    Attributes:
+        text_collection: Collection of text embeddings.
+        image_collection: Collection of image embeddings.
+
+    Example:
+        >>> store = FlatVectorStore()
+        >>> print(f"Indexed {len(store.text_collection)} products")
+    """
+
+    def __init__(self):
+        """Open the text and image collections under ``vector_db_path``."""
+        root = Path(settings.vector_db_path)
+        self.text_collection = FlatCollection(root / "products_text")
+        self.image_collection = FlatCollection(root / "products_images")
@@ -0,0 +1,404 @@
+"""In-memory brute-force vector store for small catalogs.
+
+This module provides ``InMemoryVectorStore``, which keeps each collection
+as one contiguous ``(N, D)`` float32 matrix and ranks every row for every
+query. For catalogs below a few tens of thousands of products an exact
+SIMD scan is faster than traversing an HNSW graph and has no recall loss,
+so the agent tools load the persisted catalog into this store at startup
+and search it without touching Chroma or USearch.
+
+Cosine distances come from SimSIMD's hand-tuned kernels when the package
+is installed, falling back to a NumPy matrix product otherwise. The best
+``n_results`` are selected with ``np.argpartition`` and only those are
+sorted.
+
+Example:
+    >>> store = InMemoryVectorStore.from_vector_store(create_vector_store())
+    >>> results = store.search_text(query_embedding, n_results=5)
+
+Dependencies:
+    - numpy: Embedding matrices and top-k selection
+    - simsimd: Optional SIMD cosine distance kernels
+
+Classes:
+    InMemoryCollection: One embedding matrix plus its product records.
+    InMemoryVectorStore: Text and image collections behind the VectorStore API.
+"""
+
+from backend.services.vector_store import (
+    _matches_document, _matches_where, _normalize_rows, _product_document, _product_metadata
+)
+from typing import Any, Dict, List, Optional, Set, Tuple
+import logging
+import numpy as np
+
+# Imported before USearch by backend.services; see the note there.
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+logger = logging.getLogger(__name__)
+
+# Vectorized comparisons for price filters, by Chroma operator.
+_PRICE_OPS = {
+    "$eq": np.equal,
+    "$ne": np.not_equal,
+    "$gt": np.greater,
+    "$gte": np.greater_equal,
+    "$lt": np.less,
+    "$lte": np.less_equal
+}
+
+# Rows upcast at a time when scoring a float16 matrix without SimSIMD.
+SCORE_BLOCK_ROWS = 4096
+
+def _dot_scores(queries: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Score float32 queries against every matrix row by dot product.
+
+    NumPy has no BLAS kernel for float16, and multiplying a half-precision
+    matrix directly is several times slower than float32. Such matrices
+    are upcast one block of rows at a time instead, so each block goes
+    through sgemm while the temporary copy stays small.
+    """
+    if matrix.dtype == np.float32:
+        return queries @ matrix.T
+    scores = np.empty((len(queries), len(matrix)), dtype=np.float32)
+    for start in range(0, len(matrix), SCORE_BLOCK_ROWS):
+        end = start + SCORE_BLOCK_ROWS
+        np.matmul(queries, matrix[start:end].astype(np.float32).T, out=scores[:, start:end])
+    return scores
+
+def _cosine_distances(queries: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Cosine distances from float32 queries to every unit-length matrix row.
+
+    Uses SimSIMD when it is available. If its dtype dispatch is broken,
+    which happens when USearch was loaded before it, a warning is logged
+    once and every later search uses the NumPy scorer.
+    """
+    global simsimd
+    if simsimd is not None:
+        try:
+            # SimSIMD needs matching dtypes; half-precision matrices keep
+            # their 2-byte lanes and the queries are cast down to match.
+            return np.asarray(simsimd.cdist(queries.astype(matrix.dtype), matrix, metric="cosine"))
+        except TypeError as e:
+            logger.warning(f"SimSIMD cdist failed, using NumPy for in-memory search: {e}")
+            simsimd = None
+    # Rows are unit length, so ranking by -dot matches cosine distance.
+    return -_dot_scores(queries, matrix)
+
+class InMemoryCollection:
+    """Product records and their embeddings held as one float32 matrix.
+
+    Attributes:
+        products: Product records, in matrix row order.
+        documents: Searchable text per product, used by document filters.
+        embeddings: ``(N, D)`` float32 matrix of unit-length rows.
+    """
+
+    def __init__(self):
+        self.products: List[Dict] = []
+        self.documents: List[str] = []
+        self.embeddings: Optional[np.ndarray] = None
+        self._metadatas: List[Dict[str, Any]] = []
+        self._positions: Dict[str, int] = {}
+        self._column_cache = None
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def upsert(self, products: List[Dict], embeddings: Any, documents: Optional[List[str]] = None) -> None:
+        """Append new products and replace stored ones with the same id.
+
+        Rows are normalized once here so the NumPy fallback ranks a query
+        with a plain matrix product.
+        """
+        if not len(products):
+            return
+        vectors = _normalize_rows(embeddings)
+        positions = []
+        for row, product in enumerate(products):
+            document = documents[row] if documents is not None else ""
+            position = self._positions.get(product["id"])
+            if position is None:
+                position = self._positions[product["id"]] = len(self.products)
+                self.products.append(product)
+                self.documents.append(document)
+                self._metadatas.append(_product_metadata(product))
+            else:
+                self.products[position] = product
+                self.documents[position] = document
+                self._metadatas[position] = _product_metadata(product)
+            positions.append(position)
+        self._column_cache = None
+
+        stored = 0 if self.embeddings is None else len(self.embeddings)
+        if len(self.products) > stored:
+            grown = np.zeros((len(self.products), vectors.shape[1]), dtype=np.float32)
+            if stored:
+                grown[:stored] = self.embeddings
+            self.embeddings = grown
+        self.embeddings[positions] = vectors
+
+    def clear(self) -> None:
+        """Drop every product and embedding."""
+        self.products = []
+        self.documents = []
+        self.embeddings = None
+        self._metadatas = []
+        self._positions = {}
+        self._column_cache = None
+
+    def delete(self, ids: List[str]) -> bool:
+        """Remove products and their rows; return whether any were stored."""
+        removed = {self._positions[id] for id in ids if id in self._positions}
+        if not removed:
+            return False
+        keep = [row for row in range(len(self.products)) if row not in removed]
+        self.products = [self.products[row] for row in keep]
+        self.documents = [self.documents[row] for row in keep]
+        self._metadatas = [self._metadatas[row] for row in keep]
+        self._positions = {p["id"]: row for row, p in enumerate(self.products)}
+        self.embeddings = np.asarray(self.embeddings[keep], dtype=np.float32) if keep else None
+        self._column_cache = None
+        return True
+
+    def update_records(self, products: List[Dict]) -> None:
+        """Replace the records of stored products, keeping their vectors."""
+        for product in products:
+            position = self._positions.get(product["id"])
+            if position is not None:
+                self.products[position] = product
+                self._metadatas[position] = _product_metadata(product)
+        self._column_cache = None
+
+    def get_catalog(self) -> Tuple[List[Dict], np.ndarray]:
+        """Return every product and its embedding as float32, in row order."""
+        if self.embeddings is None:
+            return [], []
+        return list(self.products), np.asarray(self.embeddings, dtype=np.float32)
+
+    def _columns(self) -> Tuple[Dict[str, int], np.ndarray, np.ndarray]:
+        """Return the category vocabulary, per-row category codes and prices.
+
+        Built on first use after a write, so common filters compare small
+        integer and float arrays instead of walking metadata dicts.
+        """
+        if self._column_cache is None:
+            categories = [metadata["category"] for metadata in self._metadatas]
+            vocabulary = {category: code for code, category in enumerate(dict.fromkeys(categories))}
+            codes = np.array([vocabulary[category] for category in categories], dtype=np.int32)
+            prices = np.array([metadata["price"] for metadata in self._metadatas], dtype=np.float64)
+            self._column_cache = (vocabulary, codes, prices)
+        return self._column_cache
+
+    def _where_mask(self, where: Dict) -> Optional[np.ndarray]:
+        """Evaluate a category/price filter as a boolean row mask.
+
+        Handles ``$and`` of conditions on ``category`` (equality and
+        membership) and ``price`` (comparisons). Returns None for any
+        other filter, which is then evaluated row by row.
+        """
+        vocabulary, codes, prices = self._columns()
+        mask = np.ones(len(self.products), dtype=bool)
+        for key, condition in where.items():
+            if key == "$and":
+                for clause in condition:
+                    clause_mask = self._where_mask(clause)
+                    if clause_mask is None:
+                        return None
+                    mask &= clause_mask
+                continue
+            if key not in ("category", "price"):
+                return None
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            for op, operand in condition.items():
+                if key == "price":
+                    compare = _PRICE_OPS.get(op)
+                    if compare is None:
+                        return None
+                    mask &= compare(prices, operand)
+                elif op in ("$eq", "$ne"):
+                    hit = codes == vocabulary.get(operand, -1)
+                    mask &= ~hit if op == "$ne" else hit
+                elif op in ("$in", "$nin"):
+                    hit = np.isin(codes, [vocabulary[c] for c in operand if c in vocabulary])
+                    mask &= ~hit if op == "$nin" else hit
+                else:
+                    return None
+        return mask
+
+    def _candidates(self, where: Optional[Dict], where_document: Optional[Dict]) -> Optional[np.ndarray]:
+        """Return the row indices passing the filters, or None if unfiltered."""
+        if where is None and where_document is None:
+            return None
+        mask = self._where_mask(where) if where is not None else None
+        if mask is None and where is not None:
+            return np.array([
+                row for row in range(len(self.products))
+                if _matches_where(self._metadatas[row], where)
+                and (where_document is None or _matches_document(self.documents[row], where_document))
+            ], dtype=np.intp)
+        rows = np.flatnonzero(mask) if mask is not None else np.arange(len(self.products))
+        if where_document is not None:
+            rows = np.array([
+                row for row in rows if _matches_document(self.documents[row], where_document)
+            ], dtype=np.intp)
+        return rows
+
+    def search(
+        self,
+        query_embeddings: Any,
+        n_results: int,
+        where: Optional[Dict] = None,
+        where_document: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        """Return the nearest products for each query embedding, exactly."""
+        queries = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+        if self.embeddings is None or n_results <= 0:
+            return [[] for _ in range(len(queries))]
+
+        rows = self._candidates(where, where_document)
+        matrix = self.embeddings if rows is None else self.embeddings[rows]
+        k = min(n_results, len(matrix))
+        if k == 0:
+            return [[] for _ in range(len(queries))]
+
+        distances = _cosine_distances(queries, matrix)
+
+        results = []
+        for row_distances in distances:
+            top = np.argpartition(row_distances, k - 1)[:k]
+            top = top[np.argsort(row_distances[top])]
+            if rows is not None:
+                top = rows[top]
+            results.append([self.products[i] for i in top])
+        return results
+
+class InMemoryVectorStore:
+    """Exact vector store that scans in-memory embedding matrices.
+
+    Exposes the same methods as the ChromaDB ``VectorStore``, so it can
+    stand in for the persistent store wherever searches are made.
+
+    Attributes:
+        text_collection: Collection of text embeddings.
+        image_collection: Collection of image embeddings.
+
+    Example:
+        >>> store = InMemoryVectorStore()
+        >>> store.add_products_text(products, text_embeddings)
+        >>> results = store.search_text(query_embedding, n_results=5)
+    """
+
+    def __init__(self):
+        self.text_collection = InMemoryCollection()
+        self.image_collection = InMemoryCollection()
+
+    @classmethod
+    def from_vector_store(cls, vector_store: Any) -> "InMemoryVectorStore":
+        """Copy both catalogs of a persistent vector store into memory.
+
+        Args:
+            vector_store: A populated ``VectorStore`` or ``USearchVectorStore``.
+
+        Returns:
+            An InMemoryVectorStore holding the same products and embeddings.
+        """
+        store = cls()
+        products, embeddings = vector_store.get_text_catalog()
+        if products:
+            store.add_products_text(products, embeddings)
+        products, embeddings = vector_store.get_image_catalog()
+        if products:
+            store.add_products_images(products, embeddings)
+        return store
+
+    def update_products(self, products: List[Dict]) -> None:
+        """Refresh the stored records of products without re-embedding them."""
+        self.text_collection.update_records(products)
+        self.image_collection.update_records(products)
+
+    def get_text_documents(self, ids: List[str]) -> Dict[str, str]:
+        """Map each stored id among ``ids`` to its stored text document."""
+        positions = self.text_collection._positions
+        return {id: self.text_collection.documents[positions[id]] for id in ids if id in positions}
+
+    def get_image_keys(self, ids: List[str]) -> Dict[str, str]:
+        """Map each stored id among ``ids`` to the key of its embedded image."""
+        positions = self.image_collection._positions
+        return {id: self.image_collection.documents[positions[id]] for id in ids if id in positions}
+
+    def delete_products(self, ids: List[str]) -> None:
+        """Remove products from both collections."""
+        self.text_collection.delete(ids)
+        self.image_collection.delete(ids)
+
+    def get_product_ids(self) -> Set[str]:
+        """Return the ids stored in either collection."""
+        return set(self.text_collection._positions) | set(self.image_collection._positions)
+
+    def reset(self) -> None:
+        """Remove every product from both collections."""
+        self.text_collection.clear()
+        self.image_collection.clear()
+
+    def count_products(self) -> int:
+        """Return the number of products in the larger collection."""
+        return max(len(self.text_collection), len(self.image_collection))
+
+    def get_text_catalog(self) -> Tuple[List[Dict], np.ndarray]:
+        """Return every product and its text embedding."""
+        return self.text_collection.get_catalog()
+
+    def get_image_catalog(self) -> Tuple[List[Dict], np.ndarray]:
+        """Return every product and its image embedding."""
+        return self.image_collection.get_catalog()
+
+    def add_products_text(self, products: List[Dict], embeddings: List[List[float]]):
+        """Add products with text embeddings to the text collection."""
+        self.text_collection.upsert(products, embeddings, [_product_document(p) for p in products])
+
+    def add_products_images(self, products: List[Dict], embeddings: List, image_keys: Optional[List[str]] = None):
+        """Add products with image embeddings to the image collection."""
+        self.image_collection.upsert(products, embeddings, image_keys)
+
+    def search_text(
+        self,
+        query_embedding: List[float],
+        n_results: int = 5,
+        where: Optional[Dict] = None,
+        where_document: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Search for products using text-based semantic similarity."""
+        return self.search_text_batch([query_embedding], n_results, where, where_document)[0]
+
+    def search_text_batch(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 5,
+        where: Optional[Dict] = None,
+        where_document: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        """Run several text searches in one distance computation."""
+        return self.text_collection.search(query_embeddings, n_results, where, where_document)
+
+    def search_image(
+        self,
+        query_embedding: List[float],
+        n_results: int = 5,
+        where: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Search for products using image-based visual similarity."""
+        return self.search_image_batch([query_embedding], n_results, where)[0]
+
+    def search_image_batch(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 5,
+        where: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        """Run several image searches in one distance computation."""
+        return self.image_collection.search(query_embeddings, n_results, where)
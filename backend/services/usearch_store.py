@@ -0,0 +1,356 @@
+"""USearch-backed vector store with half-precision product vectors.
+
+This module provides ``USearchVectorStore``, the default vector store. It
+replaces the ChromaDB-backed ``VectorStore`` with the same public methods
+while searching in-process with SIMD cosine kernels, without Chroma's
+per-query client, SQLite and serialization overhead. Each of the
+two collections (text and image) is a USearch HNSW index whose vectors are
+quantized to float16 on insert, halving index memory and the bandwidth of
+every cosine distance evaluation. Product records live in a JSON sidecar
+next to each index, keyed by the integer index key.
+
+Set ``VECTOR_STORE_BACKEND=chroma`` to use ChromaDB instead;
+``create_vector_store`` in ``backend.services.vector_store`` returns the
+configured backend.
+
+Example:
+    >>> store = USearchVectorStore()
+    >>> store.add_products_text(products, text_embeddings)
+    >>> results = store.search_text(query_embedding, n_results=5)
+
+Dependencies:
+    - usearch: HNSW index with SIMD distance kernels
+    - orjson: For reading and writing the product sidecar files
+
+Classes:
+    USearchCollection: One persisted index plus its product records.
+    USearchVectorStore: Text and image collections behind the VectorStore API.
+"""
+
+from usearch.index import Index
+from backend.config import get_settings
+from backend.services.vector_store import _matches_document, _matches_where, _product_document, _product_metadata
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+import numpy as np
+import orjson
+import os
+
+settings = get_settings()
+
+class USearchCollection:
+    """A persisted USearch index and the product records it points to.
+
+    The index lives at ``<path>.usearch`` and the product records, stored
+    in key order, at ``<path>.json``. The index is created on the first
+    insert, when the embedding dimension is known.
+
+    Attributes:
+        path: Path prefix of the index and sidecar files.
+        index: The USearch index, or None while the collection is empty.
+        products: Product records; a record's position is its index key,
+            and deleted products leave a None in their position.
+        documents: Per-product text: the searchable document in the text
+            collection, the image key in the image collection.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        dtype: str = "f16",
+        connectivity: int = 16,
+        expansion_add: int = 64,
+        expansion_search: int = 100
+    ):
+        """Open a collection, loading the index and records if they exist.
+
+        Args:
+            path: Path prefix of the index and sidecar files.
+            dtype: USearch scalar kind vectors are quantized to on insert.
+            connectivity: HNSW graph degree used when building the index.
+            expansion_add: Candidate list size while inserting.
+            expansion_search: Candidate list size while searching.
+        """
+        self.path = path
+        self.dtype = dtype
+        self.connectivity = connectivity
+        self.expansion_add = expansion_add
+        self.expansion_search = expansion_search
+        self.index: Optional[Index] = None
+        self.products: List[Dict] = []
+        self.documents: List[str] = []
+        self._keys: Dict[str, int] = {}
+
+        index_file = path.with_suffix(".usearch")
+        records_file = path.with_suffix(".json")
+        if index_file.exists() and records_file.exists():
+            self.index = Index.restore(str(index_file))
+            self.index.expansion_search = expansion_search
+            records = orjson.loads(records_file.read_bytes())
+            self.products = records["products"]
+            self.documents = records["documents"]
+            self._keys = {p["id"]: key for key, p in enumerate(self.products) if p is not None}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def upsert(self, products: List[Dict], embeddings: Any, documents: Optional[List[str]] = None) -> None:
+        """Insert new products, replace stored ones with the same id, and persist."""
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if not len(products):
+            return
+        if self.index is None:
+            self.index = Index(
+                ndim=vectors.shape[1],
+                metric="cos",
+                dtype=self.dtype,
+                connectivity=self.connectivity,
+                expansion_add=self.expansion_add,
+                expansion_search=self.expansion_search
+            )
+
+        # A product listed twice keeps its last occurrence.
+        rows = sorted({product["id"]: row for row, product in enumerate(products)}.values())
+        keys = []
+        replaced = []
+        for row in rows:
+            product = products[row]
+            document = documents[row] if documents is not None else ""
+            key = self._keys.get(product["id"])
+            if key is None:
+                key = self._keys[product["id"]] = len(self.products)
+                self.products.append(product)
+                self.documents.append(document)
+            else:
+                self.products[key] = product
+                self.documents[key] = document
+                replaced.append(key)
+            keys.append(key)
+
+        if replaced:
+            self.index.remove(np.array(replaced, dtype=np.uint64))
+        self.index.add(np.array(keys, dtype=np.uint64), vectors[rows])
+        self.save()
+
+    def update_records(self, products: List[Dict]) -> None:
+        """Replace the records of stored products, keeping their vectors."""
+        updated = False
+        for product in products:
+            key = self._keys.get(product["id"])
+            if key is not None:
+                self.products[key] = product
+                updated = True
+        if updated:
+            self.save()
+
+    def delete(self, ids: List[str]) -> None:
+        """Remove products from the index and persist.
+
+        Keys are never reused, so a deleted product's record is replaced
+        with None rather than shifting the keys of the products after it.
+        """
+        keys = [self._keys.pop(id) for id in ids if id in self._keys]
+        if not keys:
+            return
+        self.index.remove(np.array(keys, dtype=np.uint64))
+        for key in keys:
+            self.products[key] = None
+            self.documents[key] = ""
+        self.save()
+
+    def clear(self) -> None:
+        """Drop every product and delete the index files.
+
+        The next upsert builds a new index with the current settings.
+        """
+        self.index = None
+        self.products = []
+        self.documents = []
+        self._keys = {}
+        self.path.with_suffix(".usearch").unlink(missing_ok=True)
+        self.path.with_suffix(".json").unlink(missing_ok=True)
+
+    def ids(self) -> Set[str]:
+        """Return the ids of every stored product."""
+        return set(self._keys)
+
+    def get_documents(self, ids: List[str]) -> Dict[str, str]:
+        """Return the stored documents for the given ids that exist."""
+        return {id: self.documents[self._keys[id]] for id in ids if id in self._keys}
+
+    def save(self) -> None:
+        """Write the index and product records atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        index_file = self.path.with_suffix(".usearch")
+        records_file = self.path.with_suffix(".json")
+        tmp_index = index_file.with_suffix(".usearch.tmp")
+        tmp_records = records_file.with_suffix(".json.tmp")
+        self.index.save(str(tmp_index))
+        tmp_records.write_bytes(orjson.dumps({"products": self.products, "documents": self.documents}))
+        os.replace(tmp_index, index_file)
+        os.replace(tmp_records, records_file)
+
+    def search(
+        self,
+        query_embeddings: Any,
+        n_results: int,
+        where: Optional[Dict] = None,
+        where_document: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        """Return the nearest products for each query embedding.
+
+        Filtered searches rank the whole collection and keep the first
+        ``n_results`` matches, which is exact for catalogs of this size.
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if self.index is None or not len(self.products) or n_results <= 0:
+            return [[] for _ in range(len(queries))]
+
+        filtered = where is not None or where_document is not None
+        count = len(self.products) if filtered else min(n_results, len(self.products))
+        matches = self.index.search(queries, count)
+        # A single query comes back as Matches, several as BatchMatches.
+        if len(queries) == 1:
+            rows = [matches.keys]
+        else:
+            rows = [keys[:found] for keys, found in zip(matches.keys, matches.counts)]
+
+        results = []
+        for row_keys in rows:
+            row = []
+            for key in row_keys:
+                product = self.products[int(key)]
+                if where is not None and not _matches_where(_product_metadata(product), where):
+                    continue
+                if where_document is not None and not _matches_document(self.documents[int(key)], where_document):
+                    continue
+                row.append(product)
+                if len(row) == n_results:
+                    break
+            results.append(row)
+        return results
+
+    def get_catalog(self) -> Tuple[List[Dict], np.ndarray]:
+        """Return every stored product and its vector as float32, in key order."""
+        keys = sorted(self._keys.values())
+        if not keys:
+            return [], []
+        vectors = self.index.get(np.array(keys, dtype=np.uint64))
+        return [self.products[key] for key in keys], np.asarray(vectors, dtype=np.float32).reshape(len(keys), -1)
+
+class USearchVectorStore:
+    """Vector store backed by float16 USearch indexes.
+
+    Exposes the same methods as the ChromaDB ``VectorStore`` so the
+    agent tools and setup script work unchanged with either backend.
+
+    Attributes:
+        text_collection: Collection of text embeddings.
+        image_collection: Collection of image embeddings.
+
+    Example:
+        >>> store = USearchVectorStore()
+        >>> print(f"Indexed {len(store.text_collection)} products")
+    """
+
+    def __init__(self):
+        """Open the text and image collections under ``vector_db_path``."""
+        root = Path(settings.vector_db_path)
+        options = dict(
+            dtype=settings.usearch_dtype,
+            connectivity=settings.usearch_connectivity,
+            expansion_add=settings.usearch_expansion_add,
+            expansion_search=settings.usearch_expansion_search
+        )
+        self.text_collection = USearchCollection(root / "products_text", **options)
+        self.image_collection = USearchCollection(root / "products_images", **options)
+
+    def add_products_text(self, products: List[Dict], embeddings: List[List[float]]):
+        """Add products with text embeddings to the text collection."""
+        documents = [_product_document(p) for p in products]
+        self.text_collection.upsert(products, embeddings, documents)
+
+    def add_products_images(self, products: List[Dict], embeddings: List, image_keys: Optional[List[str]] = None):
+        """Add products with image embeddings to the image collection.
+
+        ``image_keys`` identify the image file each embedding was encoded
+        from, so setup can tell when a file has changed.
+        """
+        self.image_collection.upsert(products, embeddings, image_keys)
+
+    def delete_products(self, ids: List[str]) -> None:
+        """Remove products from both collections."""
+        self.text_collection.delete(ids)
+        self.image_collection.delete(ids)
+
+    def get_product_ids(self) -> Set[str]:
+        """Return the ids stored in either collection."""
+        return self.text_collection.ids() | self.image_collection.ids()
+
+    def reset(self) -> None:
+        """Remove every product; new indexes use the current settings."""
+        self.text_collection.clear()
+        self.image_collection.clear()
+
+    def count_products(self) -> int:
+        """Return the number of products in the larger collection."""
+        return max(len(self.text_collection), len(self.image_collection))
+
+    def update_products(self, products: List[Dict]) -> None:
+        """Refresh the stored records of products without re-embedding them."""
+        self.text_collection.update_records(products)
+        self.image_collection.update_records(products)
+
+    def get_text_documents(self, ids: List[str]) -> Dict[str, str]:
+        """Map each stored id among ``ids`` to its stored text document."""
+        return self.text_collection.get_documents(ids)
+
+    def get_image_keys(self, ids: List[str]) -> Dict[str, str]:
+        """Map each stored id among ``ids`` to the key of its embedded image."""
+        return self.image_collection.get_documents(ids)
+
+    def get_text_catalog(self) -> Tuple[List[Dict], np.ndarray]:
+        """Load every product and its text embedding from the text collection."""
+        return self.text_collection.get_catalog()
+
+    def get_image_catalog(self) -> Tuple[List[Dict], np.ndarray]:
+        """Load every product and its image embedding from the image collection."""
+        return self.image_collection.get_catalog()
+
+    def search_text(
+        self,
+        query_embedding: List[float],
+        n_results: int = 5,
+        where: Optional[Dict] = None,
+        where_document: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Search for products using text-based semantic similarity."""
+        return self.search_text_batch([query_embedding], n_results, where, where_document)[0]
+
+    def search_text_batch(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 5,
+        where: Optional[Dict] = None,
+        where_document: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        """Run several text searches in one index query."""
+        return self.text_collection.search(query_embeddings, n_results, where, where_document)
+
+    def search_image(
+        self,
+        query_embedding: List[float],
+        n_results: int = 5,
+        where: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Search for products using image-based visual similarity."""
+        return self.search_image_batch([query_embedding], n_results, where)[0]
+
+    def search_image_batch(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 5,
+        where: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        """Run several image searches in one index query."""
+        return self.image_collection.search(query_embeddings, n_results, where)
@@ -23,7 +23,7 @@ Example:
 
 Dependencies:
     - chromadb: Vector database for embedding storage and similarity search
-    - json: For serializing/deserializing product metadata
+    - json: For reading product metadata written by older versions
     - typing: For type hints and annotations
 
 Attributes:
@@ -35,11 +35,174 @@ Attributes:
 import chromadb
 from chromadb.config import Settings as ChromaSettings
 from backend.config import get_settings
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set, Tuple
 import json 
+import numpy as np
 
 settings = get_settings()
 
+# Separator used to store the tags list as a single metadata string.
+TAG_SEPARATOR = ","
+
+def _product_metadata(product: Dict) -> Dict[str, Any]:
+    """Flatten a product into native Chroma metadata fields.
+    
+    Scalars are stored as typed columns, which keeps rows small, avoids a
+    JSON round trip per search hit, and lets queries filter on fields such
+    as category or price.
+    """
+    return {
+        "id": product["id"],
+        "name": product["name"],
+        "category": product["category"],
+        "description": product["description"],
+        "price": product["price"],
+        "image_path": product["image_path"],
+        "tags": TAG_SEPARATOR.join(product.get("tags", []))
+    }
+
+def _product_from_metadata(metadata: Dict[str, Any]) -> Dict:
+    """Rebuild a product dict from the metadata written by _product_metadata."""
+    if "product_data" in metadata:
+        # Stores created before metadata was flattened keep a JSON blob.
+        return json.loads(metadata["product_data"])
+    tags = metadata.get("tags", "")
+    return {
+        "id": metadata["id"],
+        "name": metadata["name"],
+        "category": metadata["category"],
+        "description": metadata["description"],
+        "price": metadata["price"],
+        "image_path": metadata["image_path"],
+        "tags": tags.split(TAG_SEPARATOR) if tags else []
+    }
+
+def _product_document(product: Dict) -> str:
+    """Build the searchable text stored alongside a product's text embedding."""
+    return f"{product['name']} {product['description']} {' '.join(product['tags'])}"
+
+# Chroma-style filters for backends that evaluate them in process.
+
+def _matches_where(metadata: Dict[str, Any], where: Dict) -> bool:
+    """Evaluate a Chroma-style metadata filter against flattened metadata.
+
+    Supports ``$and``/``$or`` and the field operators ``$eq``, ``$ne``,
+    ``$gt``, ``$gte``, ``$lt``, ``$lte``, ``$in`` and ``$nin``; a bare
+    value means ``$eq``.
+    """
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(_matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(_matches_where(metadata, clause) for clause in condition):
+                return False
+        else:
+            value = metadata.get(key)
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            for op, operand in condition.items():
+                if op == "$eq":
+                    ok = value == operand
+                elif op == "$ne":
+                    ok = value != operand
+                elif op == "$in":
+                    ok = value in operand
+                elif op == "$nin":
+                    ok = value not in operand
+                elif value is None:
+                    ok = False
+                elif op == "$gt":
+                    ok = value > operand
+                elif op == "$gte":
+                    ok = value >= operand
+                elif op == "$lt":
+                    ok = value < operand
+                elif op == "$lte":
+                    ok = value <= operand
+                else:
+                    raise ValueError(f"Unsupported filter operator: {op}")
+                if not ok:
+                    return False
+    return True
+
+def _matches_document(document: str, where_document: Dict) -> bool:
+    """Evaluate a Chroma-style document filter (``$contains``/``$not_contains``)."""
+    for op, operand in where_document.items():
+        if op == "$and":
+            ok = all(_matches_document(document, clause) for clause in operand)
+        elif op == "$or":
+            ok = any(_matches_document(document, clause) for clause in operand)
+        elif op == "$contains":
+            ok = operand in document
+        elif op == "$not_contains":
+            ok = operand not in document
+        else:
+            raise ValueError(f"Unsupported document filter operator: {op}")
+        if not ok:
+            return False
+    return True
+
+def _normalize_rows(embeddings: Any) -> np.ndarray:
+    """Stack embeddings into a float32 matrix of unit-length rows.
+    
+    Zero vectors stay zero instead of turning into NaN rows.
+    """
+    vectors = np.array(embeddings, dtype=np.float32, ndmin=2)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors /= norms
+    return vectors
+
+# Rows written per collection.upsert call when indexing the catalog.
+ADD_BATCH_SIZE = 256
+
+def _upsert_in_batches(
+    collection: Any,
+    ids: List[str],
+    embeddings: List[Any],
+    metadatas: List[Dict],
+    documents: Optional[List[str]] = None,
+    batch_size: int = ADD_BATCH_SIZE
+) -> None:
+    """Upsert records into a collection in fixed-size chunks.
+    
+    Keeps each HNSW insert and SQLite transaction bounded, so indexing a
+    large catalog does not hold every payload in memory for one write.
+    Upserting replaces records whose id is already stored, so re-running
+    setup updates products instead of failing on duplicate ids.
+    """
+    for start in range(0, len(ids), batch_size):
+        end = start + batch_size
+        collection.upsert(
+            ids=ids[start:end],
+            embeddings=embeddings[start:end],
+            metadatas=metadatas[start:end],
+            documents=documents[start:end] if documents is not None else None
+        )
+
+def create_vector_store():
+    """Open the vector store backend selected by ``vector_store_backend``.
+    
+    Returns:
+        A ``USearchVectorStore`` for "usearch" (the default), a
+        ``VectorStore`` for "chroma", or a ``FlatVectorStore`` for "flat".
+        All expose the same add and search methods.
+        
+    Raises:
+        ValueError: If the configured backend is unknown.
+    """
+    backend = settings.vector_store_backend
+    if backend == "usearch":
+        from backend.services.usearch_store import USearchVectorStore
+        return USearchVectorStore()
+    if backend == "chroma":
+        return VectorStore()
+    if backend == "flat":
+        from backend.services.flat_store import FlatVectorStore
+        return FlatVectorStore()
+    raise ValueError(f"Unknown vector store backend: {backend}")
+
 class VectorStore:
     """Vector database service for product embeddings and similarity search.
     
@@ -49,8 +212,11 @@ class VectorStore:
     and enable different types of product discovery.
     
     The vector store uses cosine similarity for all searches, which works
-    well for both semantic text search and visual image similarity. All
-    embeddings are stored with rich metadata to enable fast product retrieval.
+    well for both semantic text search and visual image similarity.
+    Embeddings and queries are normalized to unit length before they reach
+    Chroma, so the collections rank by inner product, which equals cosine
+    similarity without the per-distance norm computations. All embeddings
+    are stored with rich metadata to enable fast product retrieval.
     
     Attributes:
         client: ChromaDB persistent client for database operations.
@@ -68,7 +234,12 @@ class VectorStore:
         
         Creates a persistent ChromaDB client and initializes separate
         collections for text and image embeddings. Each collection is
-        configured with cosine similarity for optimal search performance.
+        configured with the inner product space, which is cosine similarity
+        for the unit-length vectors this class stores and queries with.
+        Collections created by older versions keep their cosine space,
+        which ranks the normalized vectors identically. The HNSW graph
+        parameters come from the ``chroma_hnsw_*`` settings and, like the
+        space, apply when a collection is created.
         
         The collections are created if they don't exist, or retrieved if
         they already exist, ensuring data persistence across application
@@ -87,13 +258,26 @@ class VectorStore:
             path=settings.vector_db_path,
             settings=ChromaSettings(anonymized_telemetry=False)
         )
+        self._open_collections()
+
+    def _open_collections(self) -> None:
+        """Open both collections, creating them with the HNSW settings if missing."""
+        # Chroma's defaults (M=16, search_ef=10) lose recall on 512- and
+        # 1536-dimensional embeddings; a denser graph and a wider search
+        # beam cost little at catalog scale.
+        hnsw_metadata = {
+            "hnsw:space": "ip",
+            "hnsw:M": settings.chroma_hnsw_m,
+            "hnsw:construction_ef": settings.chroma_hnsw_construction_ef,
+            "hnsw:search_ef": settings.chroma_hnsw_search_ef
+        }
         self.text_collection = self.client.get_or_create_collection(
             name="products_text",
-            metadata={"hnsw:space": "cosine"}
+            metadata=hnsw_metadata
         )
         self.image_collection = self.client.get_or_create_collection(
             name="products_images",
-            metadata={"hnsw:space": "cosine"}
+            metadata=hnsw_metadata
         )
 
     def add_products_text(self, products: List[Dict], embeddings: List[List[float]]):
@@ -102,7 +286,8 @@ class VectorStore:
         Stores product information along with their text embeddings for
         semantic search capabilities. Each product's text representation
         (name, description, tags) is embedded and stored with comprehensive
-        metadata for fast retrieval.
+        metadata for fast retrieval. Products whose id is already stored are
+        replaced.
         
         Args:
             products: List of product dictionaries containing product information.
@@ -134,28 +319,24 @@ class VectorStore:
             >>> print("Products added to text collection")
         """
         ids = [p["id"] for p in products]
-        documents = [f"{p['name']} {p['description']} {' '.join(p['tags'])}" for p in products]
-        metadata = [{
-            "name": p["name"],
-            "category": p["category"],
-            "price": p["price"],
-            "image_path": p["image_path"],
-            "product_data": json.dumps(p)
-        } for p in products]
+        documents = [_product_document(p) for p in products]
+        metadata = [_product_metadata(p) for p in products]
         
-        self.text_collection.add(
+        _upsert_in_batches(
+            self.text_collection,
             ids=ids,
-            embeddings=embeddings,
-            documents=documents,
-            metadatas=metadata
+            embeddings=_normalize_rows(embeddings),
+            metadatas=metadata,
+            documents=documents
         )
 
-    def add_products_images(self, products: List[Dict], embeddings: List):
+    def add_products_images(self, products: List[Dict], embeddings: List, image_keys: Optional[List[str]] = None):
         """Add products with image embeddings to the visual search collection.
         
         Stores product information along with their image embeddings for
         visual similarity search capabilities. Image embeddings are generated
         from product photos and enable "search by image" functionality.
+        Products whose id is already stored are replaced.
         
         Args:
             products: List of product dictionaries containing product information.
@@ -163,10 +344,13 @@ class VectorStore:
             embeddings: List of image embedding vectors corresponding to each
                 product. Can be NumPy arrays or lists of floats representing
                 visual features extracted from product images.
+            image_keys: Optional key per product identifying the image file
+                the embedding was encoded from, stored as the document so
+                setup can tell when a file has changed.
                 
         Raises:
             ValueError: If products and embeddings lists have different lengths.
-            TypeError: If embedding format cannot be converted to list.
+            TypeError: If embeddings cannot be converted to a float32 array.
             ChromaError: If database operation fails.
             
         Example:
@@ -183,20 +367,152 @@ class VectorStore:
             >>> print("Products added to image collection")
         """
         ids = [p["id"] for p in products]
-        metadatas = [{
-            "name": p["name"],
-            "product_data": json.dumps(p)
-        } for p in products]
-
-        embeddings_list = [emb.tolist() if hasattr(emb, 'tolist') else emb for emb in embeddings]
+        metadatas = [_product_metadata(p) for p in products]
 
-        self.image_collection.add(
+        _upsert_in_batches(
+            self.image_collection,
             ids=ids,
-            embeddings=embeddings_list,
-            metadatas=metadatas
+            embeddings=_normalize_rows(embeddings),
+            metadatas=metadatas,
+            documents=image_keys
         )
 
-    def search_text(self, query_embedding: List[float], n_results: int = 5) -> List[Dict]:
+    def update_products(self, products: List[Dict]) -> None:
+        """Refresh the stored records of products without re-embedding them.
+        
+        A product's price, category or other fields can change without
+        changing its text document or image, so setup reuses the stored
+        vectors and only rewrites the metadata. Products that are not in
+        a collection are skipped.
+        
+        Args:
+            products: Current product dictionaries from the catalog.
+            
+        Example:
+            >>> store.update_products(load_products())
+        """
+        by_id = {p["id"]: p for p in products}
+        for collection in (self.text_collection, self.image_collection):
+            stored_ids = collection.get(ids=list(by_id), include=[])['ids']
+            for start in range(0, len(stored_ids), ADD_BATCH_SIZE):
+                batch = stored_ids[start:start + ADD_BATCH_SIZE]
+                collection.update(
+                    ids=batch,
+                    metadatas=[_product_metadata(by_id[id]) for id in batch]
+                )
+
+    def get_text_documents(self, ids: List[str]) -> Dict[str, str]:
+        """Map each stored id among ``ids`` to its stored text document.
+        
+        Setup compares these with the current catalog to embed only new or
+        changed products.
+        
+        Args:
+            ids: Product ids to look up.
+            
+        Returns:
+            Dict from product id to document, for the ids that are stored.
+            
+        Example:
+            >>> stored = store.get_text_documents([p["id"] for p in products])
+        """
+        results = self.text_collection.get(ids=ids, include=["documents"])
+        return dict(zip(results['ids'], results['documents']))
+
+    def get_image_keys(self, ids: List[str]) -> Dict[str, str]:
+        """Map each stored id among ``ids`` to the key of its embedded image.
+        
+        Args:
+            ids: Product ids to look up.
+            
+        Returns:
+            Dict from product id to the image key passed to
+            add_products_images, for the ids that are stored.
+        """
+        results = self.image_collection.get(ids=ids, include=["documents"])
+        return dict(zip(results['ids'], results['documents']))
+
+    def delete_products(self, ids: List[str]) -> None:
+        """Remove products from both collections.
+        
+        Args:
+            ids: Ids of the products to remove; unknown ids are ignored.
+            
+        Example:
+            >>> store.delete_products(["prod_7"])
+        """
+        for collection in (self.text_collection, self.image_collection):
+            for start in range(0, len(ids), ADD_BATCH_SIZE):
+                collection.delete(ids=ids[start:start + ADD_BATCH_SIZE])
+
+    def get_product_ids(self) -> Set[str]:
+        """Return the ids stored in either collection.
+        
+        Returns:
+            Set of product ids, used by setup to find products that were
+            removed from the catalog.
+        """
+        return (
+            set(self.text_collection.get(include=[])['ids'])
+            | set(self.image_collection.get(include=[])['ids'])
+        )
+
+    def reset(self) -> None:
+        """Remove every product by recreating both collections.
+        
+        The collections are created again with the current HNSW settings,
+        which Chroma otherwise keeps from when they were first created.
+        """
+        for name in (self.text_collection.name, self.image_collection.name):
+            self.client.delete_collection(name)
+        self._open_collections()
+
+    def count_products(self) -> int:
+        """Return the number of products in the larger collection.
+        
+        Returns:
+            Product count, read without loading any embeddings.
+        """
+        return max(self.text_collection.count(), self.image_collection.count())
+
+    def get_text_catalog(self) -> Tuple[List[Dict], List[List[float]]]:
+        """Load every product and its text embedding from the text collection.
+        
+        Used at startup to build an in-memory search index over the whole
+        catalog without recomputing embeddings.
+        
+        Returns:
+            Tuple of (products, embeddings) in matching order. Both are
+            empty if the collection has not been populated.
+            
+        Example:
+            >>> products, embeddings = store.get_text_catalog()
+            >>> print(f"Loaded {len(products)} products")
+        """
+        results = self.text_collection.get(include=["embeddings", "metadatas"])
+        products = [_product_from_metadata(metadata) for metadata in results['metadatas']]
+        embeddings = results['embeddings'] if products else []
+        return products, embeddings
+
+    def get_image_catalog(self) -> Tuple[List[Dict], List[List[float]]]:
+        """Load every product and its image embedding from the image collection.
+        
+        Returns:
+            Tuple of (products, embeddings) in matching order. Both are
+            empty if the collection has not been populated.
+        """
+        results = self.image_collection.get(include=["embeddings", "metadatas"])
+        products = [_product_from_metadata(metadata) for metadata in results['metadatas']]
+        embeddings = results['embeddings'] if products else []
+        return products, embeddings
+
+    def search_text(
+        self,
+        query_embedding: List[float],
+        n_results: int = 5,
+        where: Optional[Dict] = None,
+        where_document: Optional[Dict] = None
+    ) -> List[Dict]:
         """Search for products using text-based semantic similarity.
         
         Performs semantic search using the provided text embedding to find
@@ -209,6 +525,12 @@ class VectorStore:
                 indexing products.
             n_results: Maximum number of similar products to return. Defaults
                 to 5 for optimal performance and user experience.
+            where: Optional Chroma metadata filter applied before ranking,
+                e.g. ``{"$and": [{"category": "footwear"}, {"price": {"$lte": 100}}]}``.
+                Filterable fields are id, name, category, description, price,
+                image_path and tags.
+            where_document: Optional Chroma filter on the stored document
+                text, e.g. ``{"$contains": "waterproof"}``.
                 
         Returns:
             List of product dictionaries ordered by semantic similarity score.
@@ -222,7 +544,7 @@ class VectorStore:
         Example:
             >>> # Get embedding for search query
             >>> query = "comfortable running shoes for marathons"
-            >>> query_embedding = embedding_service.get_text_embedding(query)
+            >>> query_embedding = await embedding_service.get_text_embedding(query)
             >>> 
             >>> # Search for similar products
             >>> results = store.search_text(query_embedding, n_results=3)
@@ -234,18 +556,50 @@ class VectorStore:
             >>> # Found: Ultra Comfort Athletic Shoes - $99.99
             >>> # Found: Long Distance Running Sneakers - $149.99
         """
+        return self.search_text_batch([query_embedding], n_results, where, where_document)[0]
+
+    def search_text_batch(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 5,
+        where: Optional[Dict] = None,
+        where_document: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        """Run several text searches in one Chroma query.
+        
+        Args:
+            query_embeddings: Text embedding vectors, one per search.
+            n_results: Maximum number of products to return per search.
+            where: Optional metadata filter applied to every search; see
+                search_text.
+            where_document: Optional document filter applied to every search.
+                
+        Returns:
+            One list of product dictionaries per query embedding, in input
+            order, each ordered by semantic similarity.
+            
+        Example:
+            >>> results = store.search_text_batch([shoes_embedding, bag_embedding])
+            >>> shoes, bags = results
+        """
         results = self.text_collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_results
+            query_embeddings=_normalize_rows(query_embeddings),
+            n_results=n_results,
+            where=where,
+            where_document=where_document
         )
         
-        products = []
-        for metadata in results['metadatas'][0]:
-            product = json.loads(metadata['product_data'])
-            products.append(product)
-        return products
+        return [
+            [_product_from_metadata(metadata) for metadata in metadatas]
+            for metadatas in results['metadatas']
+        ]
     
-    def search_image(self, query_embedding: List[float], n_results: int = 5) -> List[Dict]:
+    def search_image(
+        self,
+        query_embedding: List[float],
+        n_results: int = 5,
+        where: Optional[Dict] = None
+    ) -> List[Dict]:
         """Search for products using image-based visual similarity.
         
         Performs visual similarity search using the provided image embedding
@@ -258,6 +612,9 @@ class VectorStore:
                 the same image encoder used for indexing products.
             n_results: Maximum number of visually similar products to return.
                 Defaults to 5 for optimal performance and user experience.
+            where: Optional Chroma metadata filter applied before ranking,
+                e.g. ``{"category": "footwear"}``. Filterable fields are the
+                same as for search_text.
                 
         Returns:
             List of product dictionaries ordered by visual similarity score.
@@ -285,16 +642,38 @@ class VectorStore:
             >>> # Similar: Puma RS-X - lifestyle_shoes
             >>> # Similar: New Balance 990 - premium_shoes
         """
-        if hasattr(query_embedding, 'tolist'):
-            query_embedding = query_embedding.tolist()
+        return self.search_image_batch([query_embedding], n_results, where)[0]
 
+    def search_image_batch(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 5,
+        where: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        """Run several image searches in one Chroma query.
+        
+        Args:
+            query_embeddings: Image embedding vectors, one per search, as
+                NumPy arrays or lists of floats.
+            n_results: Maximum number of products to return per search.
+            where: Optional metadata filter applied to every search; see
+                search_image.
+                
+        Returns:
+            One list of product dictionaries per query embedding, in input
+            order, each ordered by visual similarity.
+            
+        Example:
+            >>> embeddings = image_service.encode_images_batch(["a.jpg", "b.jpg"])
+            >>> results = store.search_image_batch(list(embeddings))
+        """
         results = self.image_collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_results
+            query_embeddings=_normalize_rows(query_embeddings),
+            n_results=n_results,
+            where=where
         )
 
-        products = []
-        for metadata in results['metadatas'][0]:
-            product = json.loads(metadata['product_data'])
-            products.append(product)  
-        return products
\ No newline at end of file
+        return [
+            [_product_from_metadata(metadata) for metadata in metadatas]
+            for metadatas in results['metadatas']
+        ]
@@ -131,5 +131,9 @@ def create_sample_products():
     print("\nNote: You'll need to add actual product images to data/product_images/")
     print("Image files should be named: prod_001.jpg, prod_002.jpg, etc.")
 
+def main():
+    """Seed the sample product catalog"""
+    create_sample_products()
+
 if __name__ == "__main__":
-    create_sample_products()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -34,17 +34,21 @@ Note:
     Requires valid OpenAI API key in .env file for embedding generation.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import json
 import os
 from pathlib import Path
 import sys
+from PIL import Image
 
 project_root = Path(__file__).parent.parent.absolute()
 sys.path.insert(0, str(project_root))
 
+from openai import AsyncOpenAI
 from backend.services.embedding_service import EmbeddingService
 from backend.services.image_service import ImageService
-from backend.services.vector_store import VectorStore
+from backend.services.vector_store import _product_document, create_vector_store
 from backend.config import get_settings
 
 settings = get_settings()
@@ -71,8 +75,17 @@ def load_products():
     with open(settings.products_path, 'r') as f:
         return json.load(f)
 
+async def embed_texts(texts):
+    """Embed texts with a client scoped to this event loop.
+    
+    The script runs its own event loop, so it uses a dedicated client
+    instead of the server's shared connection pool.
+    """
+    async with AsyncOpenAI(api_key=settings.openai_api_key) as client:
+        return await EmbeddingService(client).get_batch_embeddings(texts)
+
 def setup_text_embeddings(products):
-    """Create and store text embeddings for product search.
+    """Create text embeddings for product search.
     
     Generates text embeddings for all products by combining their name,
     description, and tags into searchable vector representations.
@@ -82,58 +95,81 @@ def setup_text_embeddings(products):
         products: List of product dictionaries to process.
         
     Returns:
-        List[Dict]: Products with added text embeddings.
+        Tuple[List[Dict], List[List[float]]]: The products and their text
+        embeddings, in matching order.
         
     Example:
         >>> products = load_products()
-        >>> products_with_embeddings = setup_text_embeddings(products)
+        >>> products, embeddings = setup_text_embeddings(products)
         Creating text embeddings...
-        ✓ Created 12 text embeddings
     """
     print("Creating text embeddings...")
-    embedding_service = EmbeddingService()
     
     # Create combined text for each product
-    texts = [
-        f"{p['name']} {p['description']} {' '.join(p['tags'])}"
-        for p in products
-    ]
+    texts = [_product_document(p) for p in products]
     
-    embeddings = embedding_service.get_batch_embeddings(texts)
-    vector_store = VectorStore()
-    vector_store.add_products_text(products, embeddings)
+    return products, asyncio.run(embed_texts(texts))
+
+def image_key(image_path):
+    """Identify the current contents of an image file.
     
-    print(f"Created text embeddings for {len(products)} products")
+    Args:
+        image_path: Path to the product image.
+        
+    Returns:
+        str: The path with the file's modification time and size, so an
+        image replaced at the same path gets a new key, or None when the
+        file does not exist.
+    """
+    try:
+        stat = os.stat(image_path)
+    except OSError:
+        return None
+    return f"{image_path}:{stat.st_mtime_ns}:{stat.st_size}"
 
 def setup_image_embeddings(products):
-    """Create and store image embeddings for all products"""
-    print("Creating image embeddings...")
-    image_service = ImageService()
+    """Create image embeddings for all products with a readable image.
     
-    embeddings = []
+    Returns:
+        Tuple[List[Dict], np.ndarray, List[str]]: The products that have a
+        valid image, their image embeddings and their image keys, in
+        matching order.
+    """
+    print("Creating image embeddings...")
+    image_paths = []
     valid_products = []
     
+    # Check every image before loading CLIP, so a run where no image is
+    # readable never pays for the model.
     for product in products:
         image_path = product['image_path']
         if os.path.exists(image_path):
             try:
-                embedding = image_service.encode_image(image_path)
-                embeddings.append(embedding)
+                with Image.open(image_path) as image:
+                    image.verify()
+                image_paths.append(image_path)
                 valid_products.append(product)
             except Exception as e:
                 print(f"Warning: Could not process image for {product['name']}: {e}")
         else:
             print(f"Warning: Image not found for {product['name']}: {image_path}")
     
-    if valid_products:
-        vector_store = VectorStore()
-        vector_store.add_products_images(valid_products, embeddings)
-        print(f"Created image embeddings for {len(valid_products)} products")
-    else:
-        print("No valid product images found")
+    if not image_paths:
+        return [], [], []
+    
+    image_service = ImageService()
+    return valid_products, image_service.encode_images_batch(image_paths), [image_key(path) for path in image_paths]
 
-def main():
-    """Main setup function"""
+def main(vector_store=None, rebuild=False):
+    """Main setup function
+    
+    Args:
+        vector_store: VectorStore to populate. In-process callers pass
+            their shared instance so the database is opened only once;
+            a new store is opened when omitted.
+        rebuild: Empty the store first and embed every product again,
+            for when the embedding model or index settings have changed.
+    """
     print("=" * 50)
     print("Setting up AI Commerce Agent Data")
     print("=" * 50)
@@ -141,11 +177,57 @@ def main():
     Path(settings.vector_db_path).mkdir(parents=True, exist_ok=True)
     Path(settings.images_path).mkdir(parents=True, exist_ok=True)
     
+    # Opened before any embeddings are created so a broken database fails
+    # fast instead of after the API and CLIP work.
+    if vector_store is None:
+        vector_store = create_vector_store()
+    
+    if rebuild:
+        vector_store.reset()
+        print("Cleared the vector store to rebuild it with the current settings")
+    
     products = load_products()
     print(f"\nLoaded {len(products)} products from catalog")
     
-    setup_text_embeddings(products)
-    setup_image_embeddings(products)
+    # Products that were removed from the catalog are removed from the store.
+    ids = [p['id'] for p in products]
+    removed_ids = sorted(vector_store.get_product_ids() - set(ids))
+    if removed_ids:
+        vector_store.delete_products(removed_ids)
+        print(f"Removed {len(removed_ids)} products that are no longer in the catalog")
+    
+    # Only products that are new, or whose text or image file changed since
+    # the last run, are embedded again; the rest keep their stored vectors.
+    # A product whose image file is missing has no key and is not retried.
+    stored_documents = vector_store.get_text_documents(ids)
+    stored_image_keys = vector_store.get_image_keys(ids)
+    text_pending = [p for p in products if stored_documents.get(p['id']) != _product_document(p)]
+    image_pending = [p for p in products if stored_image_keys.get(p['id']) != image_key(p['image_path'])]
+    print(f"{len(products) - len(text_pending)} text and "
+          f"{len(products) - len(image_pending)} image embeddings are up to date")
+    
+    # Text embeddings wait on the OpenAI API while image embeddings keep
+    # the local CLIP model busy, so both are created at the same time.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        text_future = executor.submit(setup_text_embeddings, text_pending) if text_pending else None
+        image_future = executor.submit(setup_image_embeddings, image_pending) if image_pending else None
+        text_products, text_embeddings = text_future.result() if text_future else ([], [])
+        image_products, image_embeddings, image_keys = image_future.result() if image_future else ([], [], [])
+    
+    # Vector store writes stay on this thread.
+    if text_products:
+        vector_store.add_products_text(text_products, text_embeddings)
+        print(f"Created text embeddings for {len(text_products)} products")
+    
+    if image_products:
+        vector_store.add_products_images(image_products, image_embeddings, image_keys)
+        print(f"Created image embeddings for {len(image_products)} products")
+    elif image_pending:
+        print("No valid product images found")
+    
+    # Products whose vectors were reused may still have a new name, price,
+    # category or tags, so every stored record is refreshed from the catalog.
+    vector_store.update_products(products)
     
     print("\n" + "=" * 50)
     print("Setup complete! Ready to start the application.")
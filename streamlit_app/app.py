@@ -21,24 +21,52 @@ Example:
         $ streamlit run streamlit_app/app.py
         
     Then navigate to the provided URL to interact with the agent.
+    
+    Or run the agent inside the Streamlit process, without the API server:
+        $ LOCAL_MODE=1 streamlit run streamlit_app/app.py
 
 Dependencies:
     - streamlit: Web app framework
-    - requests: HTTP client for API communication
+    - httpx: Pooled HTTP client for streaming API communication
     - PIL: Image processing for uploads
     - base64: Image encoding for API transmission
 """
 
 import streamlit as st
-import requests
+import httpx
+import asyncio
 import base64
+from pathlib import Path
 from PIL import Image
 import io
 import json
 import os
+import sys
+import threading
+import time
 
 STREAM_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
 
+# Run the agent in this process instead of calling the API server.
+LOCAL_MODE = bool(os.getenv("LOCAL_MODE"))
+
+# Uploads are downscaled to fit this box before sending; CLIP sees 224px.
+UPLOAD_MAX_SIZE = (336, 336)
+UPLOAD_JPEG_QUALITY = 85
+
+# Minimum seconds between redraws of a streaming reply (~30 per second).
+REDRAW_INTERVAL = 1 / 30
+
+@st.cache_resource
+def get_http_client() -> httpx.Client:
+    """Return one HTTP client shared across Streamlit reruns.
+
+    Streamlit re-executes this script on every interaction, so the client
+    is cached as a resource to keep its pooled keep-alive connections to
+    the backend instead of opening a new connection per message.
+    """
+    return httpx.Client(timeout=60)
+
 st.set_page_config(
     page_title="ShopBot",
     page_icon="🛍️",
@@ -78,6 +106,123 @@ if "uploaded_image" not in st.session_state:
 if "processing_image_search" not in st.session_state:
     st.session_state.processing_image_search = False
 
+def encode_upload(uploaded_file) -> str:
+    """Encode an uploaded image as a compact base64 JPEG for the API.
+
+    The image is shrunk to fit ``UPLOAD_MAX_SIZE`` and saved as a quality
+    85 JPEG, which is far smaller than a lossless PNG of the original and
+    makes no difference to CLIP similarity search.
+    """
+    image = Image.open(uploaded_file)
+    image.thumbnail(UPLOAD_MAX_SIZE, Image.LANCZOS)
+    buffered = io.BytesIO()
+    image.convert("RGB").save(buffered, format="JPEG", quality=UPLOAD_JPEG_QUALITY, optimize=True)
+    return base64.b64encode(buffered.getvalue()).decode()
+
+def get_upload_data(uploaded_file) -> str:
+    """Return the encoded upload, encoding each uploaded file only once.
+
+    The result is kept in the session keyed by the upload's ``file_id``,
+    so reruns and repeated searches with the same attachment reuse it.
+    """
+    if st.session_state.get("uploaded_image_id") != uploaded_file.file_id:
+        st.session_state.uploaded_image_b64 = encode_upload(uploaded_file)
+        st.session_state.uploaded_image_id = uploaded_file.file_id
+    return st.session_state.uploaded_image_b64
+
+@st.cache_resource
+def get_local_backend():
+    """Load the agent into this process for ``LOCAL_MODE``.
+
+    Runs the same data setup and service warm-up as the API server, and
+    starts one event loop on a background thread. The agent's async
+    clients and batching queues bind to the loop they first run on, so
+    every message is streamed on this loop rather than a fresh one.
+
+    Returns:
+        Tuple of (agent, loop).
+    """
+    sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+    from backend.main import setup_data, warm_up
+    from backend.api.routes.chat import agent
+
+    setup_data()
+    warm_up()
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="local-agent", daemon=True).start()
+    return agent, loop
+
+def local_chunks(message: str, history: list, image_data: str = None):
+    """Stream reply chunks from the in-process agent.
+
+    Yields the same chunk dicts the API server sends as server-sent
+    events, without the HTTP request, base64 body or JSON round trip.
+    """
+    from backend.models.schemas import ChatMessage
+
+    agent, loop = get_local_backend()
+    stream = agent.chat_stream(
+        message=message,
+        history=[ChatMessage(**msg) for msg in history],
+        image_bytes=base64.b64decode(image_data) if image_data else None
+    )
+    try:
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(stream.__anext__(), loop).result()
+            except StopAsyncIteration:
+                return
+    finally:
+        asyncio.run_coroutine_threadsafe(stream.aclose(), loop).result()
+
+def sse_chunks(response: httpx.Response):
+    """Parse reply chunks from the API server's server-sent event stream."""
+    for line in response.iter_lines():
+        if not line.startswith("data: "):
+            continue
+        data_str = line[6:]  # Remove 'data: ' prefix
+        
+        if data_str == "[DONE]":
+            break
+            
+        try:
+            yield json.loads(data_str)
+        except json.JSONDecodeError:
+            continue
+
+def read_stream(chunks, message_placeholder):
+    """Render a streamed reply as its chunks arrive.
+
+    Content chunks are collected in a list and joined only when the reply
+    is redrawn, and redraws are throttled to ``REDRAW_INTERVAL`` so long
+    replies do not re-render the markdown on every token.
+    """
+    parts: list[str] = []
+    last_redraw = 0.0
+    
+    for chunk in chunks:
+        if chunk["type"] == "content":
+            parts.append(chunk["content"])
+            now = time.monotonic()
+            if now - last_redraw >= REDRAW_INTERVAL:
+                message_placeholder.markdown("".join(parts) + "▌")
+                last_redraw = now
+        
+        elif chunk["type"] == "complete":
+            full_response = "".join(parts)
+            st.session_state.messages[-1]["content"] = full_response
+            message_placeholder.markdown(full_response)
+            
+            # ONLY store products in session state, don't display here
+            if chunk.get("products"):
+                st.session_state.messages[-1]["products"] = chunk["products"]
+            
+            st.rerun()
+        
+        elif chunk["type"] == "error":
+            message_placeholder.error(chunk["content"])
+            break
+
 def send_message_to_api(message: str, history: list, image_data: str = None):
     """Centralized function to handle streaming API calls."""
     try:
@@ -91,61 +236,33 @@ def send_message_to_api(message: str, history: list, image_data: str = None):
             message_placeholder = st.empty()
             message_placeholder.markdown("🤔 Thinking...")
             
-            response = requests.post(
+            if LOCAL_MODE:
+                read_stream(local_chunks(message, history, image_data), message_placeholder)
+                if "uploaded_image" in st.session_state:
+                    st.session_state.uploaded_image = None
+                return
+            
+            with get_http_client().stream(
+                "POST",
                 STREAM_URL,
                 json={
                     "message": message,
                     "history": history,
                     "image": image_data
-                },
-                timeout=60,
-                stream=True
-            )
-        
-        if response.status_code == 200:
-            full_response = ""
-            
-            for line in response.iter_lines():
-                if line:
-                    line = line.decode('utf-8')
-                    if line.startswith('data: '):
-                        data_str = line[6:]  # Remove 'data: ' prefix
-                        
-                        if data_str == '[DONE]':
-                            break
-                            
-                        try:
-                            chunk = json.loads(data_str)
-                            
-                            if chunk["type"] == "content":
-                                full_response += chunk["content"]
-                                message_placeholder.markdown(full_response + "▌")
-                            
-                            elif chunk["type"] == "complete":
-                                st.session_state.messages[-1]["content"] = full_response
-                                message_placeholder.markdown(full_response)
-                                
-                                # ONLY store products in session state, don't display here
-                                if chunk.get("products"):
-                                    st.session_state.messages[-1]["products"] = chunk["products"]
-                                
-                                st.rerun()
-                            
-                            elif chunk["type"] == "error":
-                                message_placeholder.error(chunk["content"])
-                                break
-                                
-                        except json.JSONDecodeError:
-                            continue
-            
-            if "uploaded_image" in st.session_state:
-                st.session_state.uploaded_image = None
-            
-        else:
-            message_placeholder.error(f"API Error: {response.status_code}")
-            st.error(response.text)
+                }
+            ) as response:
+                if response.status_code == 200:
+                    read_stream(sse_chunks(response), message_placeholder)
+                    
+                    if "uploaded_image" in st.session_state:
+                        st.session_state.uploaded_image = None
+                    
+                else:
+                    response.read()
+                    message_placeholder.error(f"API Error: {response.status_code}")
+                    st.error(response.text)
     
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         message_placeholder.error(f"Connection Error: {str(e)}")
         st.info("Make sure the backend server is running on http://localhost:8000")
     except Exception as e:
@@ -186,10 +303,7 @@ with st.sidebar:
         st.success("✅ Image attached! Type a message or click 'Search by Image'")
 
         if st.button("🔍 Search by Image", width="stretch"):
-            image = Image.open(uploaded_file)
-            buffered = io.BytesIO()
-            image.save(buffered, format="PNG")
-            img_str = base64.b64encode(buffered.getvalue()).decode()
+            img_str = get_upload_data(uploaded_file)
 
             # Add user message with image
             user_message = {
@@ -227,15 +341,17 @@ with chat_container:
                     st.divider()
                     st.subheader("🛒 Products Found:")
                     
-                    for i in range(0, len(message["products"]), 3):
-                        cols = st.columns(3)
-                        for idx, product in enumerate(message["products"][i:i+3]):
-                            with cols[idx]:
+                    products = message["products"]
+                    for i in range(0, len(products), 3):
+                        for col, product in zip(st.columns(3), products[i:i+3]):
+                            with col:
                                 with st.container(border=True):
-                                    try:
-                                        img = Image.open(product["image_path"])
-                                        st.image(img, width="stretch")
-                                    except:
+                                    # Passing the path lets Streamlit serve the
+                                    # file itself instead of decoding it with
+                                    # PIL on every rerun.
+                                    if os.path.isfile(product["image_path"]):
+                                        st.image(product["image_path"], width="stretch")
+                                    else:
                                         st.info("📦 Product Image")
                                     
                                     st.markdown(f"**{product['name']}**")
@@ -255,10 +371,7 @@ if prompt := st.chat_input("Ask me anything about products..."):
     
     image_data = None
     if st.session_state.get("uploaded_image"):
-        image = Image.open(st.session_state.uploaded_image)
-        buffered = io.BytesIO()
-        image.save(buffered, format="PNG")
-        image_data = base64.b64encode(buffered.getvalue()).decode()
+        image_data = get_upload_data(st.session_state.uploaded_image)
         user_message["image"] = image_data
         user_message["image_file"] = st.session_state.uploaded_image  # Store for display
     